@@ -1,32 +1,178 @@
-from inspect import stack
+from array import array
 from collections import deque
 class Node():
+  __slots__=("value","children")
   def __init__(self,value):
     self.value=value
     self.children=[]
   def add_child(self,child_node):
     self.children.append(child_node)
   def __str__(self):
-     return self.children
-def DFS(node):
-  if not node:
+     return str(self.value)
+
+# Lazy traversals
+# They yield nodes one at a time, so a caller can stop as soon as it has what
+# it needs; max_depth (root = 0) prunes everything below that depth.
+
+def dfs(root,max_depth=None):
+  if not root:
     return
-  stack=[node]
-  print(stack)
+  stack=[(root,0)]
   while stack:
-    node=stack.pop()
-    print(node.value, end='->')
-    stack.extend(reversed(node.children))
+    node , depth = stack.pop()
+    yield node
+    if max_depth is None or depth<max_depth:
+      stack.extend((child,depth+1) for child in reversed(node.children))
+
+def bfs(root,max_depth=None):
+  if not root:
+    return
+  queue=deque([(root,0)])
+  while queue:
+    node , depth = queue.popleft()
+    yield node
+    if max_depth is None or depth<max_depth:
+      queue.extend((child,depth+1) for child in node.children)
+
+def find(traversal,value):
+  # Early exit: the traversal stops at the first match
+  return next((node for node in traversal if node.value==value),None)
+
+def DFS(node):
+  for n in dfs(node):
+    print(n.value, end='->')
 
 def BFS(root):
-    if not root:
+  for n in bfs(root):
+    print(n.value, end='**')
+
+# Array-backed tree
+# Node i is a slot in flat int arrays instead of an object:
+#   parent[i]        -1 for the root
+#   first_child[i]   -1 for a leaf
+#   next_sibling[i]  -1 for the last child
+# so a node costs 12 bytes plus its value, and children keep edge-list order.
+
+class ArrayTree():
+  def __init__(self):
+    self.values=[]
+    self.ids={}
+    self.parent=array('i')
+    self.first_child=array('i')
+    self.next_sibling=array('i')
+    self.root=-1
+
+  def __len__(self):
+    return len(self.values)
+
+  def _intern(self,value):
+    i=self.ids.get(value)
+    if i is None:
+      i=self.ids[value]=len(self.values)
+      self.values.append(value)
+      self.parent.append(-1)
+      self.first_child.append(-1)
+      self.next_sibling.append(-1)
+    return i
+
+  @classmethod
+  def from_edges(cls,edges,root=None):
+    # edges: iterable of (parent value, child value), read lazily. Raises
+    # ValueError unless they form one tree: no second parent, no cycle, and
+    # every node reachable from the root
+    tree=cls()
+    if root is not None:
+      tree._intern(root)
+    parent , first_child , next_sibling = tree.parent , tree.first_child , tree.next_sibling
+    last_child={}
+    for p , c in edges:
+      pi , ci = tree._intern(p) , tree._intern(c)
+      if parent[ci]!=-1 or ci==pi:
+        raise ValueError(f"{c!r} already has a parent")
+      parent[ci]=pi
+      last=last_child.get(pi)
+      if last is None:
+        first_child[pi]=ci
+      else:
+        next_sibling[last]=ci
+      last_child[pi]=ci
+    roots=[i for i in range(len(tree)) if parent[i]==-1]
+    if root is None:
+      if len(roots)!=1:
+        raise ValueError(f"edges form {len(roots)} trees, expected 1")
+      tree.root=roots[0]
+    else:
+      tree.root=tree.ids[root]
+      if parent[tree.root]!=-1:
+        raise ValueError(f"root {root!r} has a parent")
+    # Every parent chain ends at a parentless node, so nodes the walk from the
+    # root misses are in another tree or on a cycle
+    reached=sum(1 for _ in tree.dfs())
+    if reached!=len(tree):
+      raise ValueError(f"{len(tree)-reached} nodes are not reachable from the root (another tree or a cycle)")
+    return tree
+
+  def children(self,i):
+    c=self.first_child[i]
+    while c!=-1:
+      yield c
+      c=self.next_sibling[c]
+
+  def depth(self,i):
+    d=0
+    while self.parent[i]!=-1:
+      i=self.parent[i]
+      d+=1
+    return d
+
+  def path(self,i):
+    # Values from the root down to node i
+    path=[]
+    while i!=-1:
+      path.append(self.values[i])
+      i=self.parent[i]
+    return path[::-1]
+
+  def dfs(self,start=None,max_depth=None):
+    # Preorder by following the links; no stack, O(1) extra memory
+    start=self.root if start is None else start
+    if start==-1:
+      return
+    parent , first_child , next_sibling = self.parent , self.first_child , self.next_sibling
+    i , depth = start , 0
+    while True:
+      yield i
+      c=first_child[i]
+      if c!=-1 and (max_depth is None or depth<max_depth):
+        i , depth = c , depth+1
+        continue
+      # climb until a node has a next sibling, without leaving start's subtree
+      while i!=start and next_sibling[i]==-1:
+        i , depth = parent[i] , depth-1
+      if i==start:
         return
-    queue = deque([root])
-    while queue:
-        node = queue.popleft()
-        print(node.value, end='**')
-        queue.extend(node.children)
+      i=next_sibling[i]
 
+  def bfs(self,start=None,max_depth=None):
+    start=self.root if start is None else start
+    if start==-1:
+      return
+    first_child , next_sibling = self.first_child , self.next_sibling
+    level , depth = [start] , 0
+    while level:
+      yield from level
+      if max_depth is not None and depth>=max_depth:
+        return
+      nxt=array('i')
+      for i in level:
+        c=first_child[i]
+        while c!=-1:
+          nxt.append(c)
+          c=next_sibling[c]
+      level , depth = nxt , depth+1
+
+  def find(self,value,start=None,max_depth=None):
+    return next((i for i in self.bfs(start,max_depth) if self.values[i]==value),-1)
 
 
 def main():
@@ -35,12 +181,26 @@ def main():
   root.children[0].children = [Node("D")]
   root.children[1].children = [Node("E"),Node("F")]
 
-  print(list(x) for x in list(root.__str__()))
-
+  print([str(child) for child in root.children])
 
   DFS(root)
   print()
   BFS(root)
+  print()
+  print([n.value for n in bfs(root,max_depth=1)])
+  print(find(dfs(root),"E"))
+
+  tree=ArrayTree.from_edges([("A","B"),("A","C"),("B","D"),("C","E"),("C","F")])
+  print([tree.values[i] for i in tree.dfs()])
+  print([tree.values[i] for i in tree.bfs(max_depth=1)])
+  print(tree.path(tree.find("F")))
+
+  # A random tree built from a generator of edges, walked lazily
+  import random
+  random.seed(0)
+  big=ArrayTree.from_edges((random.randrange(i),i) for i in range(1,1000))
+  print(f"{len(big)} nodes, dfs visits {sum(1 for _ in big.dfs())}, "
+        f"{sum(1 for _ in big.bfs(max_depth=3))} within depth 3")
 
 if __name__ == "__main__":
-  main()
\ No newline at end of file
+  main()
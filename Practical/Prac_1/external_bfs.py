@@ -0,0 +1,298 @@
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from solution import build_move_table, encode, decode
+
+# External-memory BFS
+# Each depth layer lives on disk as a file of sorted, distinct packed states.
+# Expanding layer d streams its file and collects the children in a bounded
+# buffer; a full buffer is sorted and spilled as a run file. The runs are then
+# merged, and delayed duplicate detection drops every child that is already in
+# layer d or d-1 (in an undirected graph a child of layer d can be nowhere
+# else), by walking the sorted streams side by side. Only the buffer and one
+# read chunk per open file are ever in memory, so the state space is bounded
+# by disk, not RAM.
+
+CHUNK=4096 # records per read and write
+
+# Packed states
+# A state is an int: one 4-bit nibble per cell (row-major, first cell most
+# significant) followed by a nibble holding the blank's cell, so boards of up
+# to 16 cells fit. Records are fixed-width big-endian, which makes byte order
+# the same as numeric order: files sorted as ints merge and binary-search as
+# plain bytes.
+
+def record_size(cells):
+    return (cells+2)//2 # cells+1 nibbles, rounded up to bytes
+
+def pack(state):
+    x=0
+    for tile in state:
+        x=x<<4|tile
+    return x<<4|state.index(0)
+
+def unpack(x,cells):
+    x>>=4
+    tiles=bytearray(cells)
+    for i in range(cells-1,-1,-1):
+        tiles[i]=x&15
+        x>>=4
+    return bytes(tiles)
+
+def build_successors(n,m):
+    # For each blank cell p: (shift of the target cell's nibble, change of
+    # the nibble weights, change of the blank nibble) per move. Sliding tile t
+    # from q into p turns x into x + t*(w[p]-w[q]) + (q-p).
+    cells=n*m
+    weight=[1<<4*(cells-i) for i in range(cells)]
+    moves=build_move_table(n,m)
+    return [tuple((4*(cells-q),weight[p]-weight[q],q-p) for q in moves[p]) for p in range(cells)]
+
+def neighbors(x,table):
+    return [x+((x>>shift)&15)*dw+dq for shift , dw , dq in table[x&15]]
+
+# Sorted record files
+
+def write_records(path,states,size):
+    count=0
+    buf=[]
+    with open(path,'wb') as f:
+        for x in states:
+            buf.append(x.to_bytes(size,'big'))
+            if len(buf)==CHUNK:
+                f.write(b''.join(buf))
+                count+=len(buf)
+                buf.clear()
+        f.write(b''.join(buf))
+    return count+len(buf)
+
+def read_records(path,size):
+    from_bytes=int.from_bytes
+    with open(path,'rb') as f:
+        while True:
+            data=f.read(size*CHUNK)
+            if not data:
+                return
+            for i in range(0,len(data),size):
+                yield from_bytes(data[i:i+size],'big')
+
+def contains(path,size,x):
+    # binary search over the fixed-width records of a sorted file
+    with open(path,'rb') as f:
+        lo , hi = 0 , os.path.getsize(path)//size
+        while lo<hi:
+            mid=(lo+hi)//2
+            f.seek(mid*size)
+            y=int.from_bytes(f.read(size),'big')
+            if y<x:
+                lo=mid+1
+            elif y>x:
+                hi=mid
+            else:
+                return True
+    return False
+
+def unique(stream):
+    last=None
+    for x in stream:
+        if x!=last:
+            yield x
+            last=x
+
+def subtract(stream,seen):
+    # items of the sorted stream that are not in the sorted stream seen
+    y=next(seen,None)
+    for x in stream:
+        while y is not None and y<x:
+            y=next(seen,None)
+        if x!=y:
+            yield x
+
+class ExternalBFS():
+    def __init__(self,n,m,directory=None,buffer_states=1000000,fan_in=64):
+        # buffer_states caps the children held in memory before a run is
+        # spilled; fan_in caps the run files merged at once
+        if n*m>16:
+            raise ValueError("packed states hold at most 16 cells")
+        self.n , self.m = n , m
+        self.cells=n*m
+        self.size=record_size(self.cells)
+        self.table=build_successors(n,m)
+        self.buffer_states=buffer_states
+        self.fan_in=fan_in
+        self.owned=directory is None
+        self.directory=tempfile.mkdtemp(prefix='external_bfs') if directory is None else directory
+        os.makedirs(self.directory,exist_ok=True)
+        self.histogram=[] # states per depth
+        self.goal_depth=None
+        self.first_layer=0 # layers below this one were deleted (keep_layers=False)
+        self.runs=0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+
+    def close(self):
+        if self.owned:
+            shutil.rmtree(self.directory,ignore_errors=True)
+
+    def layer_path(self,depth):
+        return os.path.join(self.directory,f"layer{depth:04d}.bin")
+
+    def _run_path(self):
+        self.runs+=1
+        return os.path.join(self.directory,f"run{self.runs:06d}.bin")
+
+    def _spill(self,buffer):
+        buffer.sort()
+        path=self._run_path()
+        write_records(path,unique(buffer),self.size)
+        buffer.clear()
+        return path
+
+    def _reduce(self,runs):
+        # merge runs in groups until at most fan_in are left
+        while len(runs)>self.fan_in:
+            group , runs = runs[:self.fan_in] , runs[self.fan_in:]
+            path=self._run_path()
+            write_records(path,unique(heapq.merge(*(read_records(r,self.size) for r in group))),self.size)
+            for r in group:
+                os.remove(r)
+            runs.append(path)
+        return runs
+
+    def run(self,start,goal=None,max_depth=None,keep_layers=True,progress=None,stats=None):
+        # start/goal are boards in solution.encode format. Stops after the
+        # layer holding goal, after max_depth, or when the space is exhausted.
+        # Returns the depth of goal (None if not reached) and fills histogram.
+        # progress(depth, states) is called per layer; stats
+        # (search_stats.SearchStats) is counted into if given, with the
+        # largest layer as the peak frontier.
+        size , table = self.size , self.table
+        target=None if goal is None else pack(goal)
+        write_records(self.layer_path(0),[pack(start)],size)
+        self.histogram=[1]
+        self.first_layer=0
+        self.goal_depth=0 if target==pack(start) else None
+        if stats is not None:
+            stats.generated+=1
+            stats.max_frontier=max(stats.max_frontier,1)
+        depth=0
+        while self.goal_depth is None and (max_depth is None or depth<max_depth):
+            buffer , runs , produced = [] , [] , 0
+            for x in read_records(self.layer_path(depth),size):
+                for shift , dw , dq in table[x&15]:
+                    buffer.append(x+((x>>shift)&15)*dw+dq)
+                if stats is not None:
+                    stats.expand(0,0) # the frontier is the layer, counted below
+                if len(buffer)>=self.buffer_states:
+                    produced+=len(buffer)
+                    runs.append(self._spill(buffer))
+            if buffer:
+                produced+=len(buffer)
+                runs.append(self._spill(buffer))
+            runs=self._reduce(runs)
+
+            # Delayed duplicate detection against the two previous layers
+            seen=heapq.merge(*(read_records(self.layer_path(d),size) for d in (depth-1,depth) if d>=0))
+            children=unique(heapq.merge(*(read_records(r,size) for r in runs)))
+            count=write_records(self.layer_path(depth+1),subtract(children,seen),size)
+            for r in runs:
+                os.remove(r)
+            if stats is not None:
+                stats.generated+=produced
+                stats.duplicates+=produced-count
+                stats.max_frontier=max(stats.max_frontier,count)
+            if not count:
+                os.remove(self.layer_path(depth+1))
+                break
+            depth+=1
+            self.histogram.append(count)
+            if progress is not None:
+                progress(depth,count)
+            if not keep_layers and depth>=2:
+                os.remove(self.layer_path(depth-2))
+                self.first_layer=depth-1
+            if target is not None and contains(self.layer_path(depth),size,target):
+                self.goal_depth=depth
+        if stats is not None:
+            stats.finish(self.goal_depth)
+        return self.goal_depth
+
+    def depth_of(self,state):
+        x=pack(state)
+        for depth in range(self.first_layer,len(self.histogram)):
+            if contains(self.layer_path(depth),self.size,x):
+                return depth
+        return None
+
+    def path(self,state):
+        # Boards from start to state: each step back is a neighbour found by
+        # binary search in the layer one shallower
+        if self.first_layer:
+            raise ValueError("layers were not kept; run with keep_layers=True")
+        depth=self.depth_of(state)
+        if depth is None:
+            return None
+        x=pack(state)
+        states=[x]
+        for d in range(depth-1,-1,-1):
+            x=next(y for y in neighbors(x,self.table) if contains(self.layer_path(d),self.size,y))
+            states.append(x)
+        return [unpack(x,self.cells) for x in reversed(states)]
+
+def external_search(start,goal,n,m,**options):
+    # Shortest path from start to goal (encoded boards) by external BFS,
+    # or None; options go to ExternalBFS
+    with ExternalBFS(n,m,**options) as bfs:
+        if bfs.run(start,goal) is None:
+            return None
+        return bfs.path(goal)
+
+def distance_histogram(start,n,m,progress=None,**options):
+    # Number of states at each distance from start, over the whole space;
+    # only the last two layers are kept on disk
+    with ExternalBFS(n,m,**options) as bfs:
+        bfs.run(start,keep_layers=False,progress=progress)
+        return bfs.histogram
+
+def main():
+    start_state = [
+        [1, 2, 3],
+        [4, 8, 6],
+        [7, 5, 0]
+    ]
+    goal_state = [
+        [1, 2, 3],
+        [4, 0, 5],
+        [7, 6, 8]
+    ]
+    n , m = len(start_state) , len(start_state[0])
+    path=external_search(encode(start_state),encode(goal_state),n,m,buffer_states=10000)
+    if path is None:
+        print("No solution found.")
+    else:
+        print(f"------:Solution ({len(path)-1} moves):------")
+        for state in path:
+            for row in decode(state,m):
+                print(row)
+            print()
+
+    # Full distance histogram of the 8-puzzle with a small buffer, so every
+    # layer beyond the first few is spilled and merged from several runs
+    n , m = (int(sys.argv[1]) , int(sys.argv[2])) if len(sys.argv)>2 else (3 , 3)
+    goal=bytes(list(range(1,n*m))+[0])
+    began=time.time()
+    histogram=distance_histogram(goal,n,m,buffer_states=20000)
+    for depth , count in enumerate(histogram):
+        print(f"{depth:3d} {count}")
+    print(f"{sum(histogram)} states, {time.time()-began:.1f}s")
+
+if __name__=="__main__":
+    main()
@@ -1,27 +1,56 @@
-import copy
+from collections import deque
+from time import perf_counter
 class Node():
+    __slots__=("state","action","parent")
     def __init__(self,state,action,parent):
         self.state=state
         self.action=action
         self.parent=parent
 
+# State encoding
+# A board is packed into a bytes object, one byte per cell in row-major
+# order, so a 3x3 state costs 9 bytes and hashes/compares in C.
+
+def encode(puzzle):
+    return bytes(tile for row in puzzle for tile in row)
+
+def decode(state,width):
+    return [list(state[i:i+width]) for i in range(0,len(state),width)]
+
+def build_move_table(n,m):
+    # moves[i] lists the cells the blank can slide into from cell i
+    moves=[]
+    for i in range(n*m):
+        row , col = divmod(i,m)
+        targets=[]
+        for dr , dc in [(1,0),(0,1),(-1,0),(0,-1)]:
+            nr , nc = row +dr , col+dc
+            if 0<=nr < n and 0 <= nc<m:
+                targets.append(nr*m+nc)
+        moves.append(tuple(targets))
+    return moves
+
 # Stack frontier
 
 class StackFrontier():
     def __init__(self):
-        self.frontier=[]
+        self.frontier=deque()
+        self.states=set() # mirrors the frontier for O(1) membership
     
     def add(self,node):
         self.frontier.append(node)
+        self.states.add(node.state)
     
     
     def contain_state(self,state):
-        return any(node.state==state for node in self.frontier)
+        return state in self.states
     
     def remove(self):
         if self.isEmpty():
             raise Exception("Frontier is empty")
-        return self.frontier.pop()
+        node=self.frontier.pop()
+        self.states.discard(node.state)
+        return node
     
     def isEmpty(self):
         return len(self.frontier)==0
@@ -32,31 +61,21 @@ class QueueFrontier(StackFrontier):
     def remove(self):
         if self.isEmpty():
             raise Exception("Frontier is empty")
-        return self.frontier.pop(0) # <- FIFO
+        node=self.frontier.popleft() # <- FIFO
+        self.states.discard(node.state)
+        return node
     
-def get_neighbors(puzzle):
+def get_neighbors(state,moves):
     nbd=[]
-    n = len(puzzle)
-    m = len(puzzle[0])
-
-    row , col= None , None # index of blank space
-    # finding the empty place index
-    for i in range(n):
-        for j in range(m):
-            if puzzle[i][j]==0:
-                row , col = i , j
-        
-    moves=[(1,0),(0,1),(-1,0),(0,-1)]
-
-    for dr , dc in moves:
-        nr , nc = row +dr , col+dc 
-        if 0<=nr < n and 0 <= nc<m:
-            newpuzzle=copy.deepcopy(puzzle)
-            # swaping the tile
-            newpuzzle[row][col] , newpuzzle[nr][nc] = newpuzzle[nr][nc],newpuzzle[row][col]
-            nbd.append(newpuzzle) 
+    blank=state.index(0) # index of blank space
+
+    for target in moves[blank]:
+        newstate=bytearray(state)
+        # swaping the tile
+        newstate[blank] , newstate[target] = newstate[target] , 0
+        nbd.append(bytes(newstate))
     return nbd   
-def print_solution(node):
+def print_solution(node,width):
     path=[]
     while node is not None:
         path.append(node.state)
@@ -66,11 +85,122 @@ def print_solution(node):
 
     print("------:Solution:------")
     for state in path:
-        for row in state:
+        for row in decode(state,width):
             print(row)
         print()
         
-def main():
+# Instrumentation
+# The searches take an optional stats object (search_stats.SearchStats in the
+# Practical directory). Without one they only pay a None check per expansion.
+
+def _depth(node):
+    depth=0
+    while node.parent is not None:
+        node , depth = node.parent , depth+1
+    return depth
+
+def breadth_first_search(start,goal,moves,stats=None):
+    startNode=Node(state=start,parent=None,action=None)
+    frontier=QueueFrontier()
+    visited=set()
+    frontier.add(startNode)
+    timing=stats is not None and stats.timing
+    if stats is not None:
+        stats.generated+=1
+
+    while not frontier.isEmpty():
+        if timing: t=perf_counter()
+        node=frontier.remove()
+        if timing: stats.queue_time+=perf_counter()-t
+
+        if node.state==goal:
+            if stats is not None:
+                stats.finish(_depth(node))
+            return node
+        visited.add(node.state)
+
+        if timing: t=perf_counter()
+        neighbors=get_neighbors(node.state,moves)
+        if timing:
+            now=perf_counter()
+            stats.successor_time+=now-t
+            t=now
+        for neighbor in neighbors:
+            if neighbor not in visited and not frontier.contain_state(neighbor):
+                child=Node(state=neighbor,parent=node,action=None)
+                frontier.add(child)
+            elif stats is not None:
+                stats.duplicates+=1
+        if stats is not None:
+            if timing: stats.queue_time+=perf_counter()-t
+            stats.generated+=len(neighbors)
+            stats.expand(len(frontier.frontier),len(visited))
+    if stats is not None:
+        stats.finish(None)
+    return None
+
+# Bidirectional search
+# Grows one BFS layer at a time from whichever end has the smaller frontier.
+# Each side maps state -> (parent state, depth); once a generated state is
+# already known to the other side the two parent chains are joined.
+
+def _expand_layer(layer,depth,seen,other,moves,stats=None):
+    next_layer=[]
+    meet=None
+    for state in layer:
+        neighbors=get_neighbors(state,moves)
+        if stats is not None:
+            stats.generated+=len(neighbors)
+            stats.expand(len(layer),len(seen)+len(other))
+        for neighbor in neighbors:
+            if neighbor in seen:
+                if stats is not None:
+                    stats.duplicates+=1
+                continue
+            seen[neighbor]=(state,depth)
+            next_layer.append(neighbor)
+            # keep going to the end of the layer so the shortest join wins
+            if neighbor in other and (meet is None or other[neighbor][1]<other[meet][1]):
+                meet=neighbor
+    return next_layer,meet
+
+def _chain(seen,state):
+    chain=[]
+    while state is not None:
+        chain.append(state)
+        state=seen[state][0]
+    return chain
+
+def bidirectional_search(start,goal,moves,stats=None):
+    forward , backward = {start:(None,0)} , {goal:(None,0)}
+    forward_layer , backward_layer = [start] , [goal]
+    depth_f , depth_b = 0 , 0
+    meet=start if start==goal else None
+    if stats is not None:
+        stats.generated+=2
+
+    while meet is None and forward_layer and backward_layer:
+        if len(forward_layer)<=len(backward_layer):
+            depth_f+=1
+            forward_layer,meet=_expand_layer(forward_layer,depth_f,forward,backward,moves,stats)
+        else:
+            depth_b+=1
+            backward_layer,meet=_expand_layer(backward_layer,depth_b,backward,forward,moves,stats)
+    if meet is None:
+        if stats is not None:
+            stats.finish(None)
+        return None
+
+    # start ... meet from the forward side, then meet ... goal from the backward side
+    path=_chain(forward,meet)[::-1]+_chain(backward,meet)[1:]
+    node=None
+    for state in path:
+        node=Node(state=state,parent=node,action=None)
+    if stats is not None:
+        stats.finish(len(path)-1)
+    return node
+
+def main(bidirectional=False,stats=None):
     start_state = [
         [1, 2, 3],
         [4, 8, 6],
@@ -81,25 +211,19 @@ def main():
         [4, 0, 5],
         [7, 6, 8]
     ]
-    startNode=Node(state=start_state,parent=None,action=None)
-    frontier=QueueFrontier()
-    visited=set()
-    frontier.add(startNode)
-
-    while not frontier.isEmpty():
-        node=frontier.remove()
+    n , m = len(start_state) , len(start_state[0])
+    moves=build_move_table(n,m)
+    start , goal = encode(start_state) , encode(goal_state)
 
-        if node.state==goal_state:
-            print_solution(node)
-            return True
-        visited.add(tuple(map(tuple,node.state)))
-
-        for nieghbor in get_neighbors(node.state):
-            if tuple(map(tuple,nieghbor)) not in visited and not  frontier.contain_state(nieghbor):
-                child=Node(state=nieghbor,parent=node,action=None)
-                frontier.add(child)
-    print("No solution found.")
-    return False
+    search=bidirectional_search if bidirectional else breadth_first_search
+    node=search(start,goal,moves,stats)
+    if node is None:
+        print("No solution found.")
+        return False
+    print_solution(node,m)
+    if stats is not None:
+        print(stats.summary())
+    return True
 
 if __name__=="__main__":
-    main()
\ No newline at end of file
+    main()
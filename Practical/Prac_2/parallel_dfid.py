@@ -0,0 +1,134 @@
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from solution import SearchResult, encode, decode, build_move_table, depth_limited_search, print_solution
+
+# Parallel iterative deepening
+# The root is expanded breadth-first to a shallow split depth k, and every
+# distinct state there becomes an independent work unit: a depth-limited
+# search of limit - k moves below it, with the k states above it counted as
+# on the path. Each iteration feeds the units one at a time to a process
+# pool, so a worker that finishes a small subtree immediately takes the next
+# one from the shared queue instead of waiting for the slowest worker; there
+# are several units per worker so the deep, uneven subtrees even out. The
+# first unit that reaches the goal ends the search and the pool is torn down,
+# stopping every other worker.
+#
+# Limits up to k are searched sequentially: they are cheap, and it means
+# every solution found by a unit is longer than k, so none is missed above
+# the split. Every limit below the current one failed, so the first path
+# found is a shortest one, as in the sequential search.
+
+UNITS_PER_WORKER=8
+
+_goal=None
+_moves=None
+
+def _init_worker(goal,moves):
+    global _goal , _moves
+    _goal , _moves = goal , moves
+
+def _search_unit(unit):
+    # runs in a worker: one subtree at one limit
+    state , prefix , limit , transposition = unit
+    table={} if transposition else None
+    path,nodes,cutoff=depth_limited_search(bytearray(state),_goal,limit,_moves,table,prefix=prefix)
+    return (None if path is None else list(prefix)+path),nodes,cutoff
+
+def split_root(start,moves,depth):
+    # The distinct states `depth` moves below start, each with one cycle-free
+    # path to it. Two paths to the same state lead to the same subtree, so
+    # only the first is kept. Returns [(state, states above it)] and the
+    # number of states generated.
+    units=[(start,())]
+    nodes=1
+    for _ in range(depth):
+        seen=set()
+        layer=[]
+        for state , prefix in units:
+            blank=state.index(0)
+            for target in moves[blank]:
+                board=bytearray(state)
+                board[blank] , board[target] = board[target] , 0
+                child=bytes(board)
+                if child in seen or child in prefix:
+                    continue
+                seen.add(child)
+                layer.append((child,prefix+(state,)))
+        nodes+=len(layer)
+        units=layer
+    return units,nodes
+
+def choose_split(start,moves,workers,max_depth=8):
+    # the shallowest depth with enough units to keep every worker busy
+    depth=1
+    units,nodes=split_root(start,moves,depth)
+    while len(units)<UNITS_PER_WORKER*workers and depth<max_depth:
+        depth+=1
+        units,nodes=split_root(start,moves,depth)
+    return depth
+
+def parallel_iterative_deepening_search(start_state,goal_state,max_depth=1000,transposition=False,
+                                        workers=None,split_depth=None):
+    # Same result as iterative_deepening_search, with each deep iteration
+    # spread over `workers` processes (default: all cores)
+    n , m = len(start_state) , len(start_state[0])
+    moves=build_move_table(n,m)
+    start , goal = encode(start_state) , encode(goal_state)
+    workers=workers or os.cpu_count() or 1
+    if split_depth is None:
+        split_depth=choose_split(start,moves,workers)
+    nodes=0
+
+    # Shallow limits, sequentially
+    for limit in range(0,min(split_depth,max_depth)+1):
+        table={} if transposition else None
+        path,count,cutoff=depth_limited_search(bytearray(start),goal,limit,moves,table)
+        nodes+=count
+        if path is not None:
+            return SearchResult(True,[decode(state,m) for state in path],limit,nodes)
+        if not cutoff:
+            return SearchResult(False,[],limit,nodes)
+    if max_depth<=split_depth:
+        return SearchResult(False,[],max_depth,nodes)
+
+    units,count=split_root(start,moves,split_depth)
+    with Pool(workers,initializer=_init_worker,initargs=(goal,moves)) as pool:
+        for limit in range(split_depth+1,max_depth+1):
+            nodes+=count
+            cutoff=False
+            work=((state,prefix,limit-split_depth,transposition) for state , prefix in units)
+            for path,unit_nodes,unit_cutoff in pool.imap_unordered(_search_unit,work):
+                nodes+=unit_nodes-1 # the unit's root was counted by split_root
+                cutoff=cutoff or unit_cutoff
+                if path is not None:
+                    pool.terminate() # stop the workers still searching
+                    return SearchResult(True,[decode(state,m) for state in path],limit,nodes)
+            if not cutoff:
+                return SearchResult(False,[],limit,nodes)
+    return SearchResult(False,[],max_depth,nodes)
+
+def main():
+    start_state = [
+        [7, 2, 4],
+        [5, 0, 6],
+        [8, 3, 1]
+    ]
+    goal_state = [
+        [1, 2, 3],
+        [4, 5, 6],
+        [7, 8, 0]
+    ]
+    workers=int(sys.argv[1]) if len(sys.argv)>1 else None
+    began=time.time()
+    result=parallel_iterative_deepening_search(start_state,goal_state,transposition=True,workers=workers)
+    if result.found:
+        print_solution(result.path)
+        print(f'Solution found at depth :{result.depth} ({result.nodes} nodes, {time.time()-began:.1f}s)')
+    else:
+        print("------NO solution:------")
+
+if __name__=="__main__":
+    main()
@@ -1,95 +1,146 @@
-import copy
-class Node():
-    def __init__(self,state,action,parent):
-        self.state=state
-        self.action=action
-        self.parent=parent
+from time import perf_counter
 
-# Stack frontier
+class SearchResult():
+    def __init__(self,found,path,depth,nodes):
+        self.found=found # True if the goal was reached
+        self.path=path   # boards from start to goal, or [] when not found
+        self.depth=depth # last depth limit that was searched
+        self.nodes=nodes # nodes generated over all iterations
 
-class StackFrontier():
-    def __init__(self):
-        self.frontier=[]
-    
-    def add(self,node,depth):
-        self.frontier.append((node,depth))
-    
-    
-    def contain_state(self,state):
-        return any(node.state==state for node, depth in self.frontier)
-    
-    def remove(self):
-        if self.isEmpty():
-            raise Exception("Frontier is empty")
-        return self.frontier.pop()
-    
-    def isEmpty(self):
-        return len(self.frontier)==0
+# State encoding
+# The board is a single bytearray (one byte per cell, row-major) that the
+# search changes in place and restores on backtrack; bytes() snapshots of it
+# are used for the path and the transposition table.
 
-# Queue Frontier
+def encode(puzzle):
+    return bytes(tile for row in puzzle for tile in row)
 
-class QueueFrontier(StackFrontier):
-    def remove(self):
-        if self.isEmpty():
-            raise Exception("Frontier is empty")
-        return self.frontier.pop(0) # <- FIFO
-    
-def get_neighbors(puzzle):
-    nbd=[]
-    n = len(puzzle)
-    m = len(puzzle[0])
+def decode(state,width):
+    return [list(state[i:i+width]) for i in range(0,len(state),width)]
 
-    row , col= None , None # index of blank space
-    # finding the empty place index
-    for i in range(n):
-        for j in range(m):
-            if puzzle[i][j]==0:
-                row , col = i , j
-        
-    moves=[(1,0),(0,1),(-1,0),(0,-1)]
+def build_move_table(n,m):
+    # moves[i] lists the cells the blank can slide into from cell i
+    moves=[]
+    for i in range(n*m):
+        row , col = divmod(i,m)
+        targets=[]
+        for dr , dc in [(1,0),(0,1),(-1,0),(0,-1)]:
+            nr , nc = row +dr , col+dc
+            if 0<=nr < n and 0 <= nc<m:
+                targets.append(nr*m+nc)
+        moves.append(tuple(targets))
+    return moves
 
-    for dr , dc in moves:
-        nr , nc = row +dr , col+dc 
-        if 0<=nr < n and 0 <= nc<m:
-            newpuzzle=copy.deepcopy(puzzle)
-            # swaping the tile
-            newpuzzle[row][col] , newpuzzle[nr][nc] = newpuzzle[nr][nc],newpuzzle[row][col]
-            nbd.append(newpuzzle) 
-    return nbd   
-def print_solution(node):
-    path=[]
-    while node is not None:
-        path.append(node.state)
-        node=node.parent
-    
-    path.reverse()
+def depth_limited_search(board,goal,limit,moves,table=None,stats=None,prefix=()):
+    # Explicit-stack DFS below the current board, at most `limit` moves deep.
+    # Returns (path, nodes, cutoff): path is the list of states to the goal or
+    # None, cutoff tells whether any branch was stopped by the limit.
+    # A state already on the current path is skipped (cycle check); with a
+    # table, a state already reached at the same or a smaller depth during
+    # this iteration is skipped too.
+    # stats (search_stats.SearchStats in the Practical directory) is counted
+    # into across calls; the callers below finish it. prefix holds the states
+    # above board when it is the root of a subtree (see parallel_dfid.py);
+    # they count as on the path but are not part of the returned one.
+    start=bytes(board)
+    path=[start]
+    on_path={start,*prefix}
+    nodes=1
+    cutoff=False
+    timing=stats is not None and stats.timing
+    if stats is not None:
+        stats.generated+=1
+    if start==goal:
+        return path,nodes,cutoff
 
+    # frame: [blank cell, cell the blank came from, next move index]
+    stack=[[board.index(0),None,0]]
+    while stack:
+        frame=stack[-1]
+        blank , came_from , i = frame
+        depth=len(stack)
+        if i<len(moves[blank]) and depth<=limit:
+            frame[2]=i+1
+            if stats is not None and i==0:
+                stats.expand(depth,len(on_path) if table is None else len(table))
+            target=moves[blank][i]
+            if target==came_from: # would undo the previous move
+                continue
+            if timing: t=perf_counter()
+            board[blank] , board[target] = board[target] , 0
+            state=bytes(board)
+            if stats is not None:
+                stats.generated+=1
+                if timing:
+                    now=perf_counter()
+                    stats.successor_time+=now-t
+                    t=now
+            if state in on_path or (table is not None and table.get(state,depth+1)<=depth):
+                board[target] , board[blank] = board[blank] , 0
+                if stats is not None:
+                    stats.duplicates+=1
+                    if timing: stats.queue_time+=perf_counter()-t
+                continue
+            if table is not None:
+                table[state]=depth
+            nodes+=1
+            path.append(state)
+            on_path.add(state)
+            if timing: stats.queue_time+=perf_counter()-t
+            if state==goal:
+                return path,nodes,cutoff
+            stack.append([target,blank,0])
+        else:
+            if depth>limit and i<len(moves[blank]):
+                cutoff=True
+            stack.pop()
+            if stack:
+                # slide the blank back to where it came from
+                parent_blank=stack[-1][0]
+                board[blank] , board[parent_blank] = board[parent_blank] , 0
+                on_path.discard(path.pop())
+    return None,nodes,cutoff
+
+def iterative_deepening_search(start_state,goal_state,max_depth=1000,transposition=False,stats=None):
+    n , m = len(start_state) , len(start_state[0])
+    moves=build_move_table(n,m)
+    board=bytearray(encode(start_state))
+    goal=encode(goal_state)
+    nodes=0
+
+    for limit in range(0,max_depth+1):
+        table={} if transposition else None
+        path,count,cutoff=depth_limited_search(board,goal,limit,moves,table,stats)
+        nodes+=count
+        if path is not None:
+            if stats is not None:
+                stats.finish(len(path)-1)
+            return SearchResult(True,[decode(state,m) for state in path],limit,nodes)
+        if not cutoff: # the whole reachable space fits under this limit
+            if stats is not None:
+                stats.finish(None)
+            return SearchResult(False,[],limit,nodes)
+    if stats is not None:
+        stats.finish(None)
+    return SearchResult(False,[],max_depth,nodes)
+
+def print_solution(path):
     print("------:Solution:------")
     for state in path:
         for row in state:
             print(row)
         print()
-        
-def DFID(start_state,goal_state,limit=8):
-    MAX_LIMIT=limit
 
-    startNode=Node(state=start_state,parent=None,action=None)
-    frontier=StackFrontier()
-    visited=set()
-    frontier.add(startNode,depth=0)
-
-    while not frontier.isEmpty():
-        node , depth=frontier.remove()
-        if depth <MAX_LIMIT:
-            if node.state==goal_state:
-                print_solution(node)
-                return True
-            visited.add(tuple(map(tuple,node.state)))
-
-            for nieghbor in get_neighbors(node.state):
-                if tuple(map(tuple,nieghbor)) not in visited and not  frontier.contain_state(nieghbor):
-                    child=Node(state=nieghbor,parent=node,action=None)
-                    frontier.add(child,depth+1)
+def DFID(start_state,goal_state,limit=8,stats=None):
+    # Single depth-limited pass; iterative_deepening_search drives the limits
+    n , m = len(start_state) , len(start_state[0])
+    board=bytearray(encode(start_state))
+    path,nodes,cutoff=depth_limited_search(board,encode(goal_state),limit,build_move_table(n,m),None,stats)
+    if stats is not None:
+        stats.finish(None if path is None else len(path)-1)
+    if path is not None:
+        print_solution([decode(state,m) for state in path])
+        return True
     print(f"No solution till depth {limit}")
     return False
 
@@ -106,13 +157,13 @@ def main():
         [7, 8, 0]
 ]
 
-
-    for i in range(1,MAX_LIMIT+1):
-        if DFID(start_state,goal_state,i):
-            print(f'SOlution found at depth :{i}')
-            break
-    print("------NO solution:------")
+    result=iterative_deepening_search(start_state,goal_state,MAX_LIMIT,transposition=True)
+    if result.found:
+        print_solution(result.path)
+        print(f'SOlution found at depth :{result.depth} ({result.nodes} nodes)')
+    else:
+        print("------NO solution:------")
 
 
 if __name__=="__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,369 @@
+"""
+A complete CDCL SAT solver for the Prac_4 clause format.
+
+The local search solvers in main.py can only find assignments; when a formula
+is unsatisfiable they give up after their budget without proving anything.
+This solver always answers (given enough conflicts):
+
+- Unit propagation with two watched literals: a clause is only visited when
+  one of its two watched literals becomes false.
+- Conflict analysis to the first unique implication point (1UIP). The learnt
+  clause is minimized locally and added to the formula.
+- VSIDS branching. Variables in recent conflicts get their activity bumped,
+  and the most active unassigned variable is chosen from a lazy heap, with
+  its saved phase.
+- Restarts on the Luby sequence, and periodic deletion of learnt clauses with
+  a high LBD (number of distinct decision levels).
+
+Literals are signed ints as in main.py. Per-literal tables (watches, value)
+have 2 * num_variables + 1 entries and are indexed by num_variables + literal,
+so -v and v sit at the same distance either side of the unused middle entry.
+"""
+
+import heapq
+
+from cnf import as_clause_store
+
+SAT, UNSAT, UNKNOWN = 'SAT', 'UNSAT', 'UNKNOWN'
+
+
+def luby(i):
+    """The i-th term (from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+class CDCLSolver:
+    """Conflict-driven clause learning over a fixed set of variables."""
+    def __init__(self, clauses, num_variables, decay=0.95, restart_base=100):
+        """
+        Args:
+            clauses (list of lists of int or ClauseStore): The formula.
+            num_variables (int): Variables are numbered 1 .. num_variables.
+            decay (float): VSIDS activity decay per conflict.
+            restart_base (int): Conflicts per unit of the Luby restart sequence.
+        """
+        store = as_clause_store(clauses, num_variables)
+        self.num_variables = n = max(num_variables, store.num_variables)
+        self.decay = decay
+        self.restart_base = restart_base
+
+        self.clauses = []           # clause id -> literal list, None once deleted
+        self.learnts = {}           # learnt clause id -> LBD
+        self.watches = [[] for _ in range(2 * n + 1)]
+        self.value = [0] * (2 * n + 1)  # 1 true, -1 false, 0 unassigned
+        self.level = [0] * (n + 1)
+        self.reason = [None] * (n + 1)
+        self.phase = bytearray(n + 1)   # last value of each variable
+        self.seen = bytearray(n + 1)
+        self.trail = []
+        self.trail_lim = []         # trail length at each decision
+        self.qhead = 0
+
+        self.activity = [0.0] * (n + 1)
+        self.var_inc = 1.0
+        self.heap = [(0.0, v) for v in range(1, n + 1)]
+        self.max_learnts = max(len(store) // 3, 1000)
+
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.unsat = False
+        for clause in store:
+            self.add_clause(clause)
+
+    def add_clause(self, clause):
+        """
+        Adds a clause at decision level 0.
+
+        Returns:
+            int or None: The clause id, or None if the clause was not stored
+                         (tautology, unit, or already satisfied).
+        """
+        n = self.num_variables
+        clause = list(dict.fromkeys(clause))
+        for literal in clause:
+            if not 0 < abs(literal) <= n:
+                raise ValueError(f"Literal {literal} is outside 1..{n}")
+            if -literal in clause:
+                return None
+        self._cancel_until(0)
+        value = self.value
+        if any(value[n + literal] == 1 for literal in clause):
+            return None
+        clause = [literal for literal in clause if value[n + literal] == 0]
+        if not clause:
+            self.unsat = True
+            return None
+        if len(clause) == 1:
+            self._assign(clause[0], None)
+            if self._propagate() is not None:
+                self.unsat = True
+            return None
+        c = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[n + clause[0]].append(c)
+        self.watches[n + clause[1]].append(c)
+        return c
+
+    def _assign(self, literal, reason):
+        n = self.num_variables
+        self.value[n + literal] = 1
+        self.value[n - literal] = -1
+        variable = abs(literal)
+        self.level[variable] = len(self.trail_lim)
+        self.reason[variable] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        """Assigns all implied literals. Returns a conflicting clause id or None."""
+        n = self.num_variables
+        value, watches, clauses, trail = self.value, self.watches, self.clauses, self.trail
+        level, reason = self.level, self.reason
+        decision_level = len(self.trail_lim)
+        while self.qhead < len(trail):
+            false_literal = -trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            watching = watches[n + false_literal]
+            i = j = 0
+            end = len(watching)
+            while i < end:
+                c = watching[i]
+                i += 1
+                clause = clauses[c]
+                if clause is None:
+                    continue  # deleted learnt clause: drop the watch
+                # Keep the false watch in position 1
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+                first = clause[0]
+                if value[n + first] == 1:
+                    watching[j] = c
+                    j += 1
+                    continue
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    other = clause[k]
+                    if value[n + other] != -1:
+                        clause[1], clause[k] = other, false_literal
+                        watches[n + other].append(c)
+                        break
+                else:
+                    watching[j] = c
+                    j += 1
+                    if value[n + first] == -1:
+                        watching[j:] = watching[i:end]
+                        self.qhead = len(trail)
+                        return c
+                    # Inlined _assign: this is the hottest line of the solver
+                    value[n + first] = 1
+                    value[n - first] = -1
+                    level[abs(first)] = decision_level
+                    reason[abs(first)] = c
+                    trail.append(first)
+            del watching[j:]
+        return None
+
+    def _bump(self, variable):
+        activity = self.activity
+        activity[variable] += self.var_inc
+        if activity[variable] > 1e100:
+            for v in range(1, self.num_variables + 1):
+                activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+            self._rebuild_heap()
+        else:
+            heapq.heappush(self.heap, (-activity[variable], variable))
+
+    def _rebuild_heap(self):
+        n = self.num_variables
+        self.heap = [(-self.activity[v], v) for v in range(1, n + 1) if self.value[n + v] == 0]
+        heapq.heapify(self.heap)
+
+    def _analyze(self, conflict):
+        """
+        Derives the 1UIP clause of a conflict.
+
+        Returns:
+            tuple: (learnt clause with the asserting literal first and a
+                    literal of the backjump level second, backjump level, LBD).
+        """
+        clauses, level, reason, seen, trail = self.clauses, self.level, self.reason, self.seen, self.trail
+        current = len(self.trail_lim)
+        learnt = [0]
+        pending = 0
+        index = len(trail) - 1
+        clause = clauses[conflict]
+        start = 0
+        while True:
+            # Reason clauses hold the literal they implied at position 0
+            for literal in clause[start:]:
+                variable = abs(literal)
+                if not seen[variable] and level[variable] > 0:
+                    seen[variable] = 1
+                    self._bump(variable)
+                    if level[variable] >= current:
+                        pending += 1
+                    else:
+                        learnt.append(literal)
+            while not seen[abs(trail[index])]:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            variable = abs(literal)
+            seen[variable] = 0
+            pending -= 1
+            if pending == 0:
+                break
+            clause = clauses[reason[variable]]
+            start = 1
+        learnt[0] = -literal
+
+        # Drop literals implied by other literals of the clause
+        kept = [learnt[0]]
+        for literal in learnt[1:]:
+            r = reason[abs(literal)]
+            if r is None or any(not seen[abs(other)] and level[abs(other)] > 0
+                                for other in clauses[r][1:]):
+                kept.append(literal)
+        for literal in learnt:
+            seen[abs(literal)] = 0
+
+        if len(kept) == 1:
+            return kept, 0, 1
+        best = max(range(1, len(kept)), key=lambda k: level[abs(kept[k])])
+        kept[1], kept[best] = kept[best], kept[1]
+        lbd = len({level[abs(literal)] for literal in kept})
+        return kept, level[abs(kept[1])], lbd
+
+    def _cancel_until(self, target):
+        """Undoes every assignment above decision level target."""
+        if len(self.trail_lim) <= target:
+            return
+        n = self.num_variables
+        value, reason, phase, activity = self.value, self.reason, self.phase, self.activity
+        start = self.trail_lim[target]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            value[n + literal] = value[n - literal] = 0
+            reason[variable] = None
+            phase[variable] = literal > 0
+            heapq.heappush(self.heap, (-activity[variable], variable))
+        del self.trail[start:]
+        del self.trail_lim[target:]
+        self.qhead = start
+
+    def _pick_branch(self):
+        """The most active unassigned variable, or None if all are assigned."""
+        n = self.num_variables
+        heap, value, activity = self.heap, self.value, self.activity
+        if len(heap) > 4 * n + 100:
+            self._rebuild_heap()
+            heap = self.heap
+        while heap:
+            score, variable = heapq.heappop(heap)
+            # Skip assigned variables and entries from before a bump
+            if value[n + variable] == 0 and -score == activity[variable]:
+                return variable
+        return None
+
+    def _reduce_learnts(self):
+        """Deletes the worse half of the learnt clauses that are not reasons."""
+        locked = {self.reason[abs(literal)] for literal in self.trail}
+        candidates = sorted((c for c, lbd in self.learnts.items() if lbd > 2 and c not in locked),
+                            key=lambda c: (self.learnts[c], len(self.clauses[c])))
+        for c in candidates[len(candidates) // 2:]:
+            self.clauses[c] = None
+            del self.learnts[c]
+
+    def solve(self, max_conflicts=None):
+        """
+        Decides the formula.
+
+        Args:
+            max_conflicts (int): Give up with UNKNOWN after this many conflicts.
+
+        Returns:
+            tuple: (SAT, {variable: bool}), (UNSAT, None) or (UNKNOWN, None).
+        """
+        if self.unsat:
+            return UNSAT, None
+        self._cancel_until(0)
+        n = self.num_variables
+        conflicts = 0
+        restarts = 1
+        budget = self.restart_base * luby(restarts)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                conflicts += 1
+                budget -= 1
+                self.conflicts += 1
+                if not self.trail_lim:
+                    self.unsat = True
+                    return UNSAT, None
+                learnt, back_level, lbd = self._analyze(conflict)
+                self._cancel_until(back_level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    c = len(self.clauses)
+                    self.clauses.append(learnt)
+                    self.learnts[c] = lbd
+                    self.watches[n + learnt[0]].append(c)
+                    self.watches[n + learnt[1]].append(c)
+                    self._assign(learnt[0], c)
+                self.var_inc /= self.decay
+                if max_conflicts is not None and conflicts >= max_conflicts:
+                    self._cancel_until(0)
+                    return UNKNOWN, None
+                continue
+
+            if budget <= 0:
+                restarts += 1
+                budget = self.restart_base * luby(restarts)
+                self._cancel_until(0)
+                if len(self.learnts) > self.max_learnts:
+                    self._reduce_learnts()
+                    self.max_learnts = int(self.max_learnts * 1.1)
+                continue
+
+            variable = self._pick_branch()
+            if variable is None:
+                return SAT, {v: self.value[n + v] == 1 for v in range(1, n + 1)}
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._assign(variable if self.phase[variable] else -variable, None)
+
+
+def cdcl_solve(clauses, num_variables, max_conflicts=None):
+    """
+    Decides a SAT formula with CDCL.
+
+    Args:
+        clauses (list of lists of int or ClauseStore): The SAT formula.
+        num_variables (int): The total number of unique variables in the formula.
+        max_conflicts (int): Give up with UNKNOWN after this many conflicts.
+
+    Returns:
+        tuple: (SAT, {variable: bool}), (UNSAT, None) or (UNKNOWN, None).
+    """
+    return CDCLSolver(clauses, num_variables).solve(max_conflicts)
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    # Pigeonhole: 4 pigeons in 3 holes is unsatisfiable. Local search can only
+    # give up on it; CDCL proves it. Variable 3 * p + h + 1: pigeon p in hole h.
+    pigeons, holes = 4, 3
+    var = lambda p, h: p * holes + h + 1
+    problem_clauses = [[var(p, h) for h in range(holes)] for p in range(pigeons)]
+    problem_clauses += [[-var(p, h), -var(q, h)]
+                        for h in range(holes) for p in range(pigeons) for q in range(p + 1, pigeons)]
+
+    status, solution = cdcl_solve(problem_clauses, pigeons * holes)
+    print(f"Pigeonhole {pigeons}/{holes}: {status}")
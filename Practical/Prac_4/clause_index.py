@@ -0,0 +1,245 @@
+"""
+Occurrence index with incremental break/make scores for SAT local search.
+
+For the current assignment the index keeps, per clause, how many of its
+literals are true, and per variable:
+
+- make[v]:   unsatisfied clauses that flipping v would satisfy.
+- breaks[v]: satisfied clauses in which v is the only true literal, which
+             flipping v would therefore falsify.
+
+Flipping v changes the number of satisfied clauses by make[v] - breaks[v], so
+scoring a neighbour is O(1). flip() only visits the clauses containing v, so
+a step costs O(occurrences of v) instead of a pass over the whole formula.
+
+All per-clause and per-variable counters are typed arrays and the clauses
+themselves live in a cnf.ClauseStore, so the index stays compact on large
+formulas.
+
+Clauses can be added and retracted under the current assignment (see
+session.py); only the counts of the variables in that clause change.
+"""
+
+import random
+from array import array
+
+from cnf import as_clause_store
+
+EMPTY_CLAUSE = "empty clause: formula is unsatisfiable"
+
+
+def slot(literal):
+    """Position of literal in ClauseIndex.occurrences."""
+    return 2 * literal if literal > 0 else 1 - 2 * literal
+
+
+class ClauseIndex:
+    """Incrementally maintained scores of one assignment of a CNF formula."""
+    def __init__(self, clauses, num_variables, assignment=None):
+        """
+        Args:
+            clauses (list of lists of int or ClauseStore): The formula. Lists
+                are copied into a ClauseStore (which drops repeated literals).
+            num_variables (int): Variables are numbered 1 .. num_variables.
+            assignment: Anything indexable by variable giving a truth value
+                        (dict, list or bytearray). Random if omitted.
+
+        Raises:
+            ValueError: If the formula has an empty clause, which no flip can
+                        satisfy.
+        """
+        self.store = as_clause_store(clauses, num_variables)
+        self.num_variables = num_variables = max(num_variables, self.store.num_variables)
+
+        # Clauses that count as satisfied and are never indexed: those holding
+        # both x and -x, and retracted ones
+        self.ignored = set()
+        # occurrences[slot(literal)] lists the clauses containing literal: v at
+        # 2 * v and -v at 2 * v + 1, so new variables are appended at the end
+        self.occurrences = [array('i') for _ in range(2 * num_variables + 2)]
+        for c, clause in enumerate(self.store):
+            if not clause:
+                raise ValueError(EMPTY_CLAUSE)
+            if any(-literal in clause for literal in clause):
+                self.ignored.add(c)
+                continue
+            for literal in clause:
+                self.occurrences[slot(literal)].append(c)
+
+        if assignment is None:
+            assignment = [False] + [random.random() < 0.5 for _ in range(num_variables)]
+        self.reset(assignment)
+
+    def reset(self, assignment):
+        """Loads a new assignment and recomputes every count from scratch."""
+        n = self.num_variables
+        self.value = bytearray(n + 1)
+        for v in range(1, n + 1):
+            self.value[v] = 1 if assignment[v] else 0
+
+        m = len(self.store)
+        self.true_count = array('i', bytes(4 * m))
+        # Sum of the variables of the true literals: when a clause has exactly
+        # one true literal this is the variable that would break it
+        self.true_sum = array('q', bytes(8 * m))
+        self.make = array('i', bytes(4 * (n + 1)))
+        self.breaks = array('i', bytes(4 * (n + 1)))
+        self.unsat = []              # unsatisfied clause ids, in any order
+        self.unsat_position = array('i', [-1]) * m
+
+        for c, clause in enumerate(self.store):
+            if c in self.ignored:
+                self.true_count[c] = 2
+            else:
+                self._count_clause(c, clause)
+
+    def _count_clause(self, c, clause):
+        """Sets the counts of clause c, whose counts so far are all zero."""
+        value = self.value
+        count = 0
+        total = 0
+        for literal in clause:
+            if value[abs(literal)] == (literal > 0):
+                count += 1
+                total += abs(literal)
+        self.true_count[c] = count
+        self.true_sum[c] = total
+        if count == 0:
+            self._add_unsat(c)
+            for literal in clause:
+                self.make[abs(literal)] += 1
+        elif count == 1:
+            self.breaks[total] += 1
+
+    def _add_unsat(self, c):
+        self.unsat_position[c] = len(self.unsat)
+        self.unsat.append(c)
+
+    def _remove_unsat(self, c):
+        i = self.unsat_position[c]
+        last = self.unsat.pop()
+        if last != c:
+            self.unsat[i] = last
+            self.unsat_position[last] = i
+        self.unsat_position[c] = -1
+
+    def add_clause(self, clause):
+        """
+        Appends a clause to the store and scores it under the current assignment.
+
+        Returns:
+            int: The new clause's index.
+
+        Raises:
+            ValueError: If the clause is empty or mentions a variable above
+                        num_variables.
+        """
+        n = self.num_variables
+        if not clause:
+            raise ValueError(EMPTY_CLAUSE)
+        if any(abs(literal) > n for literal in clause):
+            raise ValueError(f"Clause {list(clause)} has a variable above {n}")
+        c = self.store.add_clause(clause)
+        clause = self.store[c]
+        self.true_count.append(0)
+        self.true_sum.append(0)
+        self.unsat_position.append(-1)
+        if any(-literal in clause for literal in clause):
+            self.ignored.add(c)
+            self.true_count[c] = 2
+            return c
+        for literal in clause:
+            self.occurrences[slot(literal)].append(c)
+        self._count_clause(c, clause)
+        return c
+
+    def add_variables(self, values):
+        """
+        Adds variables num_variables + 1, num_variables + 2, ... in place.
+
+        They are in no clause yet, so no count changes. Every array grows at
+        its end, with amortized constant cost per variable.
+
+        Args:
+            values: Truth values of the new variables, in order.
+        """
+        values = bytes(1 if value else 0 for value in values)
+        self.value += values
+        self.make.frombytes(bytes(4 * len(values)))
+        self.breaks.frombytes(bytes(4 * len(values)))
+        self.occurrences.extend(array('i') for _ in range(2 * len(values)))
+        self.num_variables += len(values)
+        if self.store.num_variables < self.num_variables:
+            self.store.num_variables = self.num_variables
+
+    def remove_clause(self, c):
+        """
+        Retracts clause c: it stays in the store but counts as satisfied.
+
+        Clause indices do not change, so callers may keep referring to others.
+        """
+        if c in self.ignored:
+            return
+        clause = self.store[c]
+        count = self.true_count[c]
+        if count == 0:
+            self._remove_unsat(c)
+            for literal in clause:
+                self.make[abs(literal)] -= 1
+        elif count == 1:
+            self.breaks[self.true_sum[c]] -= 1
+        for literal in clause:
+            self.occurrences[slot(literal)].remove(c)
+        self.true_count[c] = 2
+        self.true_sum[c] = 0
+        self.ignored.add(c)
+
+    def num_satisfied(self):
+        return len(self.store) - len(self.unsat)
+
+    def score(self, variable):
+        """Change in satisfied clauses if variable were flipped."""
+        return self.make[variable] - self.breaks[variable]
+
+    def uphill_variables(self):
+        """Variables whose flip satisfies more clauses than the current assignment."""
+        make, breaks = self.make, self.breaks
+        return [v for v in range(1, self.num_variables + 1) if make[v] > breaks[v]]
+
+    def flip(self, variable):
+        """Flips variable and updates the counts of the clauses that contain it."""
+        new_value = self.value[variable] ^ 1
+        self.value[variable] = new_value
+        true_count, true_sum = self.true_count, self.true_sum
+        make, breaks = self.make, self.breaks
+        clauses = self.store
+
+        # The slots of the literal that becomes true and of the one that becomes false
+        true_slot = 2 * variable + 1 - new_value
+        for c in self.occurrences[true_slot]:
+            count = true_count[c]
+            if count == 0:
+                self._remove_unsat(c)
+                for literal in clauses[c]:
+                    make[abs(literal)] -= 1
+                breaks[variable] += 1
+            elif count == 1:
+                breaks[true_sum[c]] -= 1
+            true_count[c] = count + 1
+            true_sum[c] += variable
+
+        for c in self.occurrences[true_slot ^ 1]:
+            count = true_count[c] - 1
+            true_count[c] = count
+            true_sum[c] -= variable
+            if count == 0:
+                self._add_unsat(c)
+                for literal in clauses[c]:
+                    make[abs(literal)] += 1
+                breaks[variable] -= 1
+            elif count == 1:
+                breaks[true_sum[c]] += 1
+
+    def assignment(self):
+        """The current assignment as a {variable: bool} dict."""
+        return {v: bool(self.value[v]) for v in range(1, self.num_variables + 1)}
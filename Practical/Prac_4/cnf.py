@@ -0,0 +1,148 @@
+"""
+Compact clause storage and a streaming DIMACS CNF reader.
+
+A ClauseStore keeps every literal of every clause in one flat array('i') and
+marks where each clause starts in an offsets array (the CSR layout), so a
+formula with millions of literals costs 4 bytes per literal instead of a
+Python list and int object per entry. Assignments that go with a store are
+bytearrays indexed by variable (index 0 unused).
+"""
+
+import gzip
+from array import array
+
+
+class ClauseStore:
+    """CNF formula in CSR form: clause i is literals[offsets[i]:offsets[i + 1]]."""
+    def __init__(self, num_variables=0):
+        self.num_variables = num_variables
+        self.literals = array('i')
+        self.offsets = array('q', [0])
+
+    @classmethod
+    def from_clauses(cls, clauses, num_variables=None):
+        """Builds a store from a list of lists of int, as used in main.py."""
+        store = cls(num_variables or 0)
+        for clause in clauses:
+            store.add_clause(clause)
+        return store
+
+    def add_clause(self, clause):
+        """Appends a clause, dropping repeated literals, and returns its index."""
+        clause = list(dict.fromkeys(clause))
+        for literal in clause:
+            if abs(literal) > self.num_variables:
+                self.num_variables = abs(literal)
+        self.literals.extend(clause)
+        self.offsets.append(len(self.literals))
+        return len(self.offsets) - 2
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.literals[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        literals, offsets = self.literals, self.offsets
+        for i in range(len(offsets) - 1):
+            yield literals[offsets[i]:offsets[i + 1]]
+
+    def new_assignment(self):
+        """An all-false assignment sized for this formula."""
+        return bytearray(self.num_variables + 1)
+
+
+def as_clause_store(clauses, num_variables=None):
+    """Returns clauses unchanged if already a ClauseStore, else converts them."""
+    if isinstance(clauses, ClauseStore):
+        if num_variables and num_variables > clauses.num_variables:
+            clauses.num_variables = num_variables
+        return clauses
+    return ClauseStore.from_clauses(clauses, num_variables)
+
+
+def _open(path):
+    if hasattr(path, 'read'):
+        return path
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == b'\x1f\x8b'
+    return gzip.open(path, 'rb') if compressed else open(path, 'rb')
+
+
+def read_dimacs(path, chunk_size=1 << 20):
+    """
+    Reads a DIMACS CNF file into a ClauseStore without loading it whole.
+
+    The file is read in chunks of chunk_size bytes; gzip files are detected by
+    their magic bytes and decompressed on the fly. Clauses may span lines.
+
+    Args:
+        path (str or binary file object): The .cnf or .cnf.gz file.
+        chunk_size (int): Bytes read per chunk.
+
+    Returns:
+        ClauseStore: The formula. num_variables comes from the 'p cnf' header
+                     (or the largest variable seen, if that is larger).
+
+    Raises:
+        ValueError: If the file ends in the middle of a clause.
+    """
+    store = ClauseStore()
+    literals, offsets = store.literals, store.offsets
+    pending = []      # literals of a clause that continues on the next line
+    leftover = b''
+    f = _open(path)
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                lines = [leftover]
+            else:
+                lines = (leftover + chunk).split(b'\n')
+                leftover = lines.pop()
+            for line in lines:
+                line = line.strip()
+                if not line or line[:1] == b'c':
+                    continue
+                if line[:1] == b'p':
+                    fields = line.split()
+                    store.num_variables = max(store.num_variables, int(fields[2]))
+                    continue
+                if line[:1] == b'%': # SATLIB end marker
+                    chunk = b''
+                    break
+                values = list(map(int, line.split()))
+                if not pending and values[-1] == 0 and 0 not in values[:-1] \
+                        and len(set(values)) == len(values):
+                    # the common case: one complete clause per line
+                    literals.extend(values[:-1])
+                    offsets.append(len(literals))
+                    continue
+                for value in values:
+                    if value == 0:
+                        store.add_clause(pending)
+                        pending = []
+                    else:
+                        pending.append(value)
+            if not chunk:
+                break
+    finally:
+        if f is not path:
+            f.close()
+    if pending:
+        raise ValueError("DIMACS input ends inside a clause")
+
+    largest = max(map(abs, literals), default=0)
+    if largest > store.num_variables:
+        store.num_variables = largest
+    return store
+
+
+def write_dimacs(store, path):
+    """Writes a ClauseStore as DIMACS CNF (gzip-compressed if path ends in .gz)."""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'wt') as f:
+        f.write(f"p cnf {store.num_variables} {len(store)}\n")
+        for clause in store:
+            f.write(" ".join(map(str, clause)) + " 0\n")
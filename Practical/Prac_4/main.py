@@ -1,15 +1,24 @@
 import random
+import sys
+
+from cdcl import SAT, cdcl_solve
+from clause_index import ClauseIndex
+from cnf import as_clause_store, read_dimacs
+from solver_stats import SolverStats, print_progress
+from vectorized import VectorizedScorer
 
 def evaluate_clauses(clauses, assignment):
     """
     Calculates how many clauses in the formula are satisfied by the given assignment.
 
     Args:
-        clauses (list of lists of int): The 3-SAT formula. Each inner list is a clause.
+        clauses (list of lists of int or ClauseStore): The 3-SAT formula. Each inner list is a clause.
                                        A positive int represents a variable, negative is its negation.
                                        Example: [[1, -2, 3], [-1, 2, -4]]
-        assignment (dict): A mapping from variable (int) to its boolean value (True/False).
+                                       A cnf.ClauseStore (e.g. from read_dimacs) works as well.
+        assignment (dict or bytearray): A mapping from variable (int) to its boolean value (True/False).
                            Example: {1: True, 2: False, 3: True, 4: False}
+                           A bytearray indexed by variable (0/1) works as well.
 
     Returns:
         int: The number of satisfied clauses.
@@ -32,60 +41,264 @@ def evaluate_clauses(clauses, assignment):
             
     return num_satisfied
 
-def stochastic_hill_climbing(clauses, num_variables, max_restarts=10, max_steps=1000):
+def stochastic_hill_climbing(clauses, num_variables, max_restarts=10, max_steps=1000, evaluation='index',
+                             stats=None, progress=None, report_every=1000):
     """
     Attempts to solve a 3-SAT problem using Stochastic Hill Climbing with random restarts.
 
     Args:
-        clauses (list of lists of int): The 3-SAT formula.
+        clauses (list of lists of int or ClauseStore): The 3-SAT formula.
         num_variables (int): The total number of unique variables in the formula.
         max_restarts (int): The maximum number of times to restart from a random assignment.
         max_steps (int): The maximum number of steps to take in each climbing attempt.
+        evaluation (str): How neighbors are scored: 'index' (incremental
+                          break/make counts, see clause_index.py) or 'numpy'
+                          (all flips scored at once, see vectorized.py).
+                          Both take the same steps.
+        stats (SolverStats): Filled in with counters for the run, if given.
+        progress (callable): Called with a SolverStats every report_every steps
+                             and at the end of every restart, if given.
+        report_every (int): Steps between progress calls.
 
     Returns:
         dict or None: A satisfying assignment (dict) if one is found, otherwise None.
     """
     total_clauses = len(clauses)
+    scorers = {'index': ClauseIndex, 'numpy': VectorizedScorer}
+    if evaluation not in scorers:
+        raise ValueError(f"Unknown evaluation mode: {evaluation}")
+    if stats is None and progress is not None:
+        stats = SolverStats()
+    track = stats is not None
+    index = None
     
     for restart in range(max_restarts):
-        # 1. Start with a random assignment
-        current_assignment = {i: random.choice([True, False]) for i in range(1, num_variables + 1)}
-        
-        print(f"\n--- Restart #{restart + 1} ---")
+        # 1. Start with a random assignment (a bytearray indexed by variable)
+        current_assignment = bytearray(random.getrandbits(1) for _ in range(num_variables + 1))
+        if index is None:
+            index = scorers[evaluation](clauses, num_variables, current_assignment)
+        else:
+            index.reset(current_assignment)
+        if track:
+            stats.restarts += 1
+            base = stats.flips
         
         for step in range(max_steps):
-            current_score = evaluate_clauses(clauses, current_assignment)
-            print(f"Step {step}: Score = {current_score}/{total_clauses}")
+            current_score = index.num_satisfied()
+            if track:
+                stats.flips = base + step
+                stats.record_best(current_score, stats.flips)
+                if progress is not None and step and step % report_every == 0:
+                    progress(stats)
 
             # 2. Check if we found a solution
             if current_score == total_clauses:
-                print("\nSolution found!")
-                return current_assignment
+                if track:
+                    stats.finish(True)
+                return index.assignment()
             
-            # 3. Find all "uphill" neighbors
-            uphill_neighbors = []
-            for var_to_flip in range(1, num_variables + 1):
-                # Create a temporary neighbor assignment by flipping one variable
-                neighbor_assignment = current_assignment.copy()
-                neighbor_assignment[var_to_flip] = not neighbor_assignment[var_to_flip]
-                
-                neighbor_score = evaluate_clauses(clauses, neighbor_assignment)
-                
-                if neighbor_score > current_score:
-                    uphill_neighbors.append((neighbor_assignment, neighbor_score))
+            # 3. Find all "uphill" neighbors: the scorer knows every flip's
+            #    effect, so no neighbor assignment has to be built
+            uphill_neighbors = index.uphill_variables()
 
             # 4. Check if we are at a local maximum
             if not uphill_neighbors:
-                print("Stuck at a local maximum or plateau. Restarting...")
+                if track:
+                    stats.plateaus += 1
                 break # Break inner loop to trigger a restart
             
             # 5. Stochastic step: randomly choose one of the better neighbors
-            best_neighbor, _ = random.choice(uphill_neighbors)
-            current_assignment = best_neighbor
+            index.flip(random.choice(uphill_neighbors))
+        else:
+            if track:
+                stats.flips = base + max_steps
+                stats.record_best(index.num_satisfied(), stats.flips)
+        if progress is not None:
+            progress(stats)
             
-    print("\nFailed to find a solution after all restarts.")
+    if track:
+        stats.finish(False)
     return None
 
+def walk(index, pick, max_restarts=10, max_flips=100000, stats=None, progress=None, report_every=10000):
+    """
+    The restart/flip loop shared by walksat and probsat.
+
+    The first try continues from the index's current assignment, so a caller
+    that keeps an index between solves (see session.py) gets a warm start.
+    Later tries restart from random assignments.
+
+    Args:
+        index (ClauseIndex): The formula and the current assignment.
+        pick (callable): pick(index, clause) returns the literal whose variable
+                         to flip, for a randomly chosen unsatisfied clause.
+        max_restarts (int): The maximum number of tries.
+        max_flips (int): The maximum number of flips per try.
+        stats, progress, report_every: As for walksat.
+
+    Returns:
+        dict or None: A satisfying assignment (dict) if one is found, otherwise None.
+    """
+    if stats is None and progress is not None:
+        stats = SolverStats()
+    track = stats is not None
+    total_clauses = len(index.store)
+    num_variables = index.num_variables
+    solution = None
+
+    for restart in range(max_restarts):
+        if restart:
+            index.reset([False] + [random.random() < 0.5 for _ in range(num_variables)])
+        if track:
+            stats.restarts += 1
+            base = stats.flips
+            best_unsat = len(index.unsat) + 1
+        unsat = index.unsat
+        flips = max_flips
+        for flip in range(max_flips):
+            if not unsat:
+                flips = flip
+                break
+            if track:
+                if len(unsat) < best_unsat:
+                    best_unsat = len(unsat)
+                    stats.record_best(total_clauses - best_unsat, base + flip)
+                if progress is not None and flip and flip % report_every == 0:
+                    stats.flips = base + flip
+                    progress(stats)
+            literal = pick(index, index.store[random.choice(unsat)])
+            if track and index.breaks[abs(literal)] > 0:
+                stats.plateaus += 1
+            index.flip(abs(literal))
+        if track:
+            stats.flips = base + flips
+            stats.record_best(total_clauses - len(unsat), stats.flips)
+        if progress is not None:
+            progress(stats)
+        if not unsat:
+            solution = index.assignment()
+            break
+    if track:
+        stats.finish(solution is not None)
+    return solution
+
+def walksat(clauses, num_variables, max_restarts=10, max_flips=100000, noise=0.5,
+            stats=None, progress=None, report_every=10000):
+    """
+    Attempts to solve a SAT problem using WalkSAT (SKC variant).
+
+    Each flip picks a random unsatisfied clause. If one of its variables can be
+    flipped without breaking any clause it is flipped; otherwise, with
+    probability `noise` a random variable of the clause is flipped, else the
+    one that breaks the fewest clauses.
+
+    Args:
+        clauses (list of lists of int or ClauseStore): The SAT formula.
+        num_variables (int): The total number of unique variables in the formula.
+        max_restarts (int): The maximum number of random restarts.
+        max_flips (int): The maximum number of flips per restart.
+        noise (float): Probability of a random walk move.
+        stats (SolverStats): Filled in with counters for the run, if given.
+            plateaus counts flips that had to break some clause.
+        progress (callable): Called with a SolverStats every report_every flips
+                             and at the end of every restart, if given.
+        report_every (int): Flips between progress calls.
+
+    Returns:
+        dict or None: A satisfying assignment (dict) if one is found, otherwise None.
+
+    Raises:
+        ValueError: If the formula has an empty clause.
+    """
+    return walk(ClauseIndex(clauses, num_variables), walksat_pick(noise),
+                max_restarts, max_flips, stats, progress, report_every)
+
+def walksat_pick(noise=0.5):
+    """WalkSAT's choice of literal in an unsatisfied clause, as a pick for walk()."""
+    def pick(index, clause):
+        breaks = index.breaks
+        best = min(clause, key=lambda literal: breaks[abs(literal)])
+        if breaks[abs(best)] > 0 and random.random() < noise:
+            best = random.choice(clause)
+        return best
+    return pick
+
+def probsat(clauses, num_variables, max_restarts=10, max_flips=100000, cb=2.38, eps=1.0,
+            stats=None, progress=None, report_every=10000):
+    """
+    Attempts to solve a SAT problem using probSAT with the polynomial break function.
+
+    Each flip picks a random unsatisfied clause and flips one of its variables
+    with probability proportional to (eps + breaks[v]) ** -cb. The defaults
+    suit random 3-SAT.
+
+    Args:
+        clauses (list of lists of int or ClauseStore): The SAT formula.
+        num_variables (int): The total number of unique variables in the formula.
+        max_restarts (int): The maximum number of random restarts.
+        max_flips (int): The maximum number of flips per restart.
+        cb (float): Exponent of the break penalty; higher is greedier.
+        eps (float): Offset so zero-break variables get a finite weight.
+        stats (SolverStats): Filled in with counters for the run, if given.
+            plateaus counts flips that had to break some clause.
+        progress (callable): Called with a SolverStats every report_every flips
+                             and at the end of every restart, if given.
+        report_every (int): Flips between progress calls.
+
+    Returns:
+        dict or None: A satisfying assignment (dict) if one is found, otherwise None.
+
+    Raises:
+        ValueError: If the formula has an empty clause.
+    """
+    return walk(ClauseIndex(clauses, num_variables), probsat_pick(cb, eps),
+                max_restarts, max_flips, stats, progress, report_every)
+
+def probsat_pick(cb=2.38, eps=1.0):
+    """probSAT's choice of literal in an unsatisfied clause, as a pick for walk()."""
+    # Weights only depend on the break count, so tabulate the common ones
+    weight_table = [(eps + b) ** -cb for b in range(64)]
+
+    def pick(index, clause):
+        breaks = index.breaks
+        weights = [weight_table[b] if b < 64 else (eps + b) ** -cb
+                   for b in (breaks[abs(literal)] for literal in clause)]
+        return random.choices(clause, weights)[0]
+    return pick
+
+# Local search solvers by name, e.g. for portfolio.py strategies
+SOLVERS = {
+    'hill': stochastic_hill_climbing,
+    'walksat': walksat,
+    'probsat': probsat,
+}
+
+def hybrid_solve(clauses, num_variables, local_restarts=5, max_flips=10000, max_conflicts=None):
+    """
+    Runs WalkSAT briefly and falls back to the complete CDCL solver (cdcl.py).
+
+    Local search is often fastest on satisfiable random formulas; CDCL also
+    handles structured and unsatisfiable ones.
+
+    Args:
+        clauses (list of lists of int or ClauseStore): The SAT formula.
+        num_variables (int): The total number of unique variables in the formula.
+        local_restarts (int): WalkSAT restarts before switching to CDCL.
+        max_flips (int): WalkSAT flips per restart.
+        max_conflicts (int): CDCL gives up with UNKNOWN after this many conflicts.
+
+    Returns:
+        tuple: (status, assignment) with status 'SAT', 'UNSAT' or 'UNKNOWN';
+               assignment is a dict for SAT and None otherwise.
+    """
+    store = as_clause_store(clauses, num_variables)
+    # Local search rejects an empty clause; CDCL reports it as UNSAT
+    if all(clause for clause in store):
+        solution = walksat(store, num_variables, max_restarts=local_restarts, max_flips=max_flips)
+        if solution is not None:
+            return SAT, solution
+    return cdcl_solve(store, num_variables, max_conflicts)
+
 # --- Example Usage ---
 if __name__ == "__main__":
     # A satisfiable 3-SAT problem instance
@@ -99,14 +312,23 @@ if __name__ == "__main__":
         [-2, -3, 4]
     ]
     problem_num_variables = 4
+
+    # Or solve a DIMACS file (optionally gzip-compressed): python main.py formula.cnf
+    if len(sys.argv) > 1:
+        problem_clauses = read_dimacs(sys.argv[1])
+        problem_num_variables = problem_clauses.num_variables
     
     print("Attempting to solve the 3-SAT problem...")
+    run_stats = SolverStats()
     solution = stochastic_hill_climbing(
         clauses=problem_clauses,
         num_variables=problem_num_variables,
         max_restarts=20, # More restarts give a higher chance of success
-        max_steps=100
+        max_steps=100,
+        stats=run_stats,
+        progress=print_progress # Omit for a silent run
     )
+    print(run_stats)
     
     if solution:
         print("\nSatisfying Assignment:")
@@ -114,4 +336,7 @@ if __name__ == "__main__":
         for var in sorted(solution.keys()):
             print(f"  Variable {var}: {solution[var]}")
     else:
-        print("\nNo solution was found for the given problem.")
\ No newline at end of file
+        print("\nNo solution was found for the given problem.")
+        # Local search cannot prove unsatisfiability; the complete solver can
+        status, solution = hybrid_solve(problem_clauses, problem_num_variables)
+        print(f"Hybrid local search + CDCL: {status}")
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""
+Parallel restart portfolio for the Prac_4 local search solvers.
+
+Restarts are independent, so they are spread over worker processes. Each
+restart is a task that names a strategy (solver plus options) and gets its
+own seed. Workers pull tasks from a shared queue, so a fast worker simply
+takes more of them. The parent keeps only a few tasks per worker queued and
+adds one each time a restart fails, so the queue stays small however many
+restarts are allowed. The first satisfying assignment is returned and every
+other worker is stopped. If a restart raises, the worker reports the error
+and the parent stops the others and raises it.
+
+The formula goes to the workers through shared memory. Its literals and
+offsets arrays are copied once into SharedMemory blocks, and each worker maps
+them as a ClauseStore view instead of receiving a pickled copy.
+"""
+
+import inspect
+import multiprocessing as mp
+import os
+import pickle
+import queue
+import random
+import time
+from multiprocessing import shared_memory
+
+from clause_index import EMPTY_CLAUSE
+from cnf import ClauseStore, as_clause_store
+from main import SOLVERS
+
+# Tasks kept queued per worker, so a worker never waits for the parent
+QUEUED_PER_WORKER = 2
+
+# Seconds between checks that no worker has died without reporting
+POLL_INTERVAL = 0.5
+
+# Strategies cycled over the restarts when none are given: probSAT plus
+# WalkSAT at two noise levels, so a portfolio hedges across settings.
+DEFAULT_STRATEGIES = [
+    ('probsat', {}),
+    ('walksat', {'noise': 0.5}),
+    ('walksat', {'noise': 0.3}),
+]
+
+
+def _share(data):
+    """Copies an array into a new SharedMemory block."""
+    block = shared_memory.SharedMemory(create=True, size=max(len(data) * data.itemsize, 1))
+    block.buf[:len(data) * data.itemsize] = data.tobytes()
+    return block
+
+
+def _attach(name, typecode, length):
+    """Maps a SharedMemory block created by the parent as a typed memoryview."""
+    block = shared_memory.SharedMemory(name=name)
+    return block, block.buf.cast(typecode)[:length]
+
+
+def _worker(layout, num_variables, tasks, results, stop, seed):
+    (lit_name, lit_len), (off_name, off_len) = layout
+    lit_block, literals = _attach(lit_name, 'i', lit_len)
+    off_block, offsets = _attach(off_name, 'q', off_len)
+    store = ClauseStore(num_variables)
+    store.literals, store.offsets = literals, offsets
+
+    try:
+        while not stop.is_set():
+            task = tasks.get()
+            if task is None:
+                break
+            restart, (name, options) = task
+            random.seed(seed + restart)
+            try:
+                solution = SOLVERS[name](store, num_variables, max_restarts=1, **options)
+            except Exception as error:
+                results.put(('error', _picklable(error)))
+                return
+            if solution is not None:
+                value = bytearray(num_variables + 1)
+                for variable, truth in solution.items():
+                    value[variable] = truth
+                results.put((restart, name, bytes(value)))
+                break
+            results.put(restart)    # failed: the parent queues another task
+        results.put(None)
+    finally:
+        del store
+        literals.release()
+        offsets.release()
+        lit_block.close()
+        off_block.close()
+
+
+def _picklable(error):
+    """The exception itself if it can go through a queue, else a RuntimeError describing it."""
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _check_strategies(strategies, store, num_variables):
+    """Raises in the parent for a strategy no worker could run."""
+    for name, options in strategies:
+        if name not in SOLVERS:
+            raise ValueError(f"Unknown strategy: {name!r} (expected one of {sorted(SOLVERS)})")
+        try:
+            inspect.signature(SOLVERS[name]).bind(store, num_variables, max_restarts=1, **options)
+        except TypeError as error:
+            raise ValueError(f"Bad options for strategy {name!r}: {error}") from None
+
+
+def portfolio_solve(clauses, num_variables, restarts=64, strategies=None, workers=None,
+                    seed=None, timeout=None):
+    """
+    Runs restarts of several local search strategies in parallel.
+
+    Args:
+        clauses (list of lists of int or ClauseStore): The SAT formula.
+        num_variables (int): The total number of unique variables in the formula.
+        restarts (int): Total number of restarts to hand out.
+        strategies (list of (str, dict)): Solver name from main.SOLVERS and
+            keyword options for it, cycled over the restarts.
+        workers (int): Number of processes; defaults to the CPU count.
+        seed (int): Base seed; restart r uses seed + r. Random if omitted.
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        dict or None: A satisfying assignment (dict) if one is found, otherwise None.
+
+    Raises:
+        ValueError: If the formula has an empty clause, or a strategy names
+                    an unknown solver or takes options it does not accept.
+        Exception: Whatever a restart raised in a worker.
+    """
+    store = as_clause_store(clauses, num_variables)
+    if not all(clause for clause in store):
+        raise ValueError(EMPTY_CLAUSE)  # raised here, since a worker would just die
+    num_variables = max(num_variables, store.num_variables)
+    strategies = strategies or DEFAULT_STRATEGIES
+    _check_strategies(strategies, store, num_variables)
+    workers = min(workers or os.cpu_count() or 1, restarts)
+    seed = random.getrandbits(32) if seed is None else seed
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    ctx = mp.get_context()
+    tasks, results, stop = ctx.Queue(), ctx.Queue(), ctx.Event()
+    queued = 0
+
+    def feed():
+        # Queue the next restart, or once all are handed out, one stop per worker
+        nonlocal queued
+        if queued < restarts:
+            tasks.put((queued, strategies[queued % len(strategies)]))
+        elif queued == restarts:
+            for _ in range(workers):
+                tasks.put(None)
+        queued += 1
+
+    for _ in range(min(restarts, QUEUED_PER_WORKER * workers)):
+        feed()
+    if restarts <= QUEUED_PER_WORKER * workers:
+        feed()
+
+    blocks = [_share(store.literals), _share(store.offsets)]
+    layout = ((blocks[0].name, len(store.literals)), (blocks[1].name, len(store.offsets)))
+    processes = [ctx.Process(target=_worker, args=(layout, num_variables, tasks, results, stop, seed),
+                             daemon=True)
+                 for _ in range(workers)]
+    try:
+        for process in processes:
+            process.start()
+        finished = 0
+        while finished < workers:
+            wait = POLL_INTERVAL if deadline is None else min(max(deadline - time.monotonic(), 0), POLL_INTERVAL)
+            try:
+                message = results.get(timeout=wait)
+            except queue.Empty:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                # A worker that died (e.g. killed) never reports; don't wait for it forever
+                for process in processes:
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError(f"A portfolio worker exited with code {process.exitcode}")
+                continue
+            if message is None:
+                finished += 1
+                continue
+            if isinstance(message, int):
+                feed()
+                continue
+            if message[0] == 'error':
+                raise message[1]
+            restart, name, value = message
+            return {v: bool(value[v]) for v in range(1, num_variables + 1)}
+        return None
+    finally:
+        # First win: cancel whatever the other workers are still running
+        stop.set()
+        # Tasks left in the queue are dropped, not flushed to dead workers
+        tasks.cancel_join_thread()
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    # A random 3-SAT instance comfortably below the 4.26 threshold
+    random.seed(0)
+    n = 2000
+    problem_clauses = [[random.choice([-1, 1]) * random.randint(1, n) for _ in range(3)]
+                       for _ in range(int(4.0 * n))]
+
+    start = time.time()
+    solution = portfolio_solve(problem_clauses, n, seed=0)
+    if solution:
+        print(f"Solution found in {time.time() - start:.2f}s")
+    else:
+        print("No solution was found for the given problem.")
@@ -0,0 +1,128 @@
+"""
+Incremental SAT sessions for sequences of closely related formulas.
+
+A SATSession keeps one ClauseIndex alive across solves. Adding or retracting
+a clause only updates the counts of that clause's variables, under the
+current assignment. Each solve continues from the last satisfying
+assignment, so after a small edit the walk typically needs a handful of
+flips instead of a cold search from a random assignment.
+
+Retracted clauses stay in the clause store as satisfied placeholders, so
+clause ids stay valid for the life of the session.
+"""
+
+import random
+import time
+
+from clause_index import ClauseIndex
+from cnf import ClauseStore
+from main import walk, walksat_pick
+
+
+class SATSession:
+    """A clause database with add/retract and warm-started local search."""
+    def __init__(self, clauses=(), num_variables=0, pick=None):
+        """
+        Args:
+            clauses (list of lists of int): Initial clauses.
+            num_variables (int): Variables are numbered 1 .. num_variables;
+                                 adding a clause with a larger one grows it.
+            pick (callable): Literal choice for main.walk; WalkSAT's by default.
+        """
+        self.pick = pick or walksat_pick()
+        self.index = ClauseIndex(ClauseStore(num_variables), num_variables)
+        self.live = set()           # ids of clauses that have not been retracted
+        self.last_solution = None   # bytes of the last satisfying assignment
+        for clause in clauses:
+            self.add_clause(clause)
+
+    @property
+    def num_variables(self):
+        return self.index.num_variables
+
+    def __len__(self):
+        return len(self.live)
+
+    def _grow(self, num_variables):
+        """Adds variables up to num_variables to the index, with random values."""
+        added = bytes(random.getrandbits(1) for _ in range(num_variables - self.index.num_variables))
+        self.index.add_variables(added)
+        if self.last_solution is not None:
+            # New variables are in no earlier clause, so any value keeps it satisfying
+            self.last_solution += added
+
+    def add_clause(self, clause):
+        """
+        Adds a clause.
+
+        Returns:
+            int: The clause id, for retract_clause.
+        """
+        largest = max((abs(literal) for literal in clause), default=0)
+        if largest > self.index.num_variables:
+            self._grow(largest)
+        c = self.index.add_clause(clause)
+        self.live.add(c)
+        return c
+
+    def retract_clause(self, clause_id):
+        """
+        Removes a clause added earlier.
+
+        Raises:
+            KeyError: If clause_id is unknown or was already retracted.
+        """
+        self.live.remove(clause_id)
+        self.index.remove_clause(clause_id)
+
+    def clauses(self):
+        """The live clauses as lists of int, e.g. to hand to cdcl.cdcl_solve."""
+        store = self.index.store
+        return [list(store[c]) for c in sorted(self.live)]
+
+    def solve(self, max_restarts=10, max_flips=100000, stats=None):
+        """
+        Looks for an assignment satisfying the current clauses.
+
+        The first try starts from the last satisfying assignment; later
+        tries restart randomly.
+
+        Args:
+            max_restarts (int): The maximum number of tries.
+            max_flips (int): The maximum number of flips per try.
+            stats (SolverStats): Filled in with counters for the run, if given.
+
+        Returns:
+            dict or None: A satisfying assignment (dict) if one is found, otherwise None.
+        """
+        index = self.index
+        if self.last_solution is not None and index.value != self.last_solution:
+            # A failed solve left a random assignment behind
+            index.reset(self.last_solution)
+        solution = walk(index, self.pick, max_restarts, max_flips, stats)
+        if solution is not None:
+            self.last_solution = bytes(index.value)
+        return solution
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    # A random 3-SAT instance, then a series of one-clause edits
+    random.seed(0)
+    n = 2000
+    random_clause = lambda: [random.choice([-1, 1]) * random.randint(1, n) for _ in range(3)]
+    session = SATSession([random_clause() for _ in range(int(3.8 * n))], n)
+
+    start = time.time()
+    session.solve()
+    print(f"Cold solve of {len(session)} clauses: {1000 * (time.time() - start):.1f} ms")
+
+    ids = sorted(session.live)
+    start = time.time()
+    for _ in range(50):
+        session.retract_clause(ids.pop(random.randrange(len(ids))))
+        ids.append(session.add_clause(random_clause()))
+        if session.solve() is None:
+            print("Edit made the formula too hard for local search")
+            break
+    print(f"Average warm re-solve after an edit: {1000 * (time.time() - start) / 50:.2f} ms")
@@ -0,0 +1,47 @@
+"""
+Counters for the Prac_4 local search solvers.
+
+The solvers in main.py print nothing by default. Pass a SolverStats to read
+counters back after a run, and/or a progress callback that is called with
+the live SolverStats every `report_every` flips. With neither, the hot loops
+only pay for a single None check per flip.
+"""
+
+import time
+
+
+class SolverStats:
+    """What a local search run did, filled in by the solver."""
+    def __init__(self):
+        self.flips = 0          # variable flips (hill-climbing steps) over all tries
+        self.restarts = 0       # tries started, including the first
+        self.plateaus = 0       # times no improving move was available
+        self.best_score = 0     # most clauses satisfied at once
+        self.history = []       # (flips, seconds, best_score) each time best_score rose
+        self.solved = False
+        self.start_time = time.perf_counter()
+        self.elapsed = 0.0
+
+    def record_best(self, score, flips):
+        """Notes a new best score reached after `flips` total flips."""
+        if score > self.best_score:
+            self.best_score = score
+            self.history.append((flips, time.perf_counter() - self.start_time, score))
+
+    def finish(self, solved):
+        self.solved = solved
+        self.elapsed = time.perf_counter() - self.start_time
+
+    def flips_per_second(self):
+        elapsed = self.elapsed or (time.perf_counter() - self.start_time)
+        return self.flips / elapsed if elapsed else 0.0
+
+    def __repr__(self):
+        return (f"SolverStats(flips={self.flips}, restarts={self.restarts}, plateaus={self.plateaus}, "
+                f"best_score={self.best_score}, solved={self.solved}, elapsed={self.elapsed:.3f}s)")
+
+
+def print_progress(stats):
+    """A progress callback that writes one status line to the console."""
+    print(f"restart {stats.restarts}: {stats.flips} flips, best {stats.best_score}, "
+          f"{stats.plateaus} plateaus, {stats.flips_per_second():.0f} flips/s")
@@ -0,0 +1,142 @@
+"""
+NumPy-vectorized clause evaluation for the Prac_4 local search.
+
+The formula becomes an (m x k) array of literals, with shorter clauses padded
+by 0 and masked out, and an assignment becomes a boolean array indexed by
+variable. One pass over that array gives the true-literal count of every
+clause. From the counts, np.bincount gives the make and break counts of
+every variable at once. That scores all n one-flip neighbours in a handful of
+array operations, and the same layout scores a whole batch of assignments,
+e.g. one per restart, in one call.
+
+NumPy is optional; the rest of Prac_4 works without it.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from cnf import as_clause_store
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Vectorized evaluation requires NumPy (pip install numpy)")
+
+
+class VectorizedFormula:
+    """Clause literals as padded NumPy arrays, with whole-formula scoring."""
+    def __init__(self, clauses, num_variables):
+        _require_numpy()
+        store = as_clause_store(clauses, num_variables)
+        self.num_variables = max(num_variables, store.num_variables)
+        self.num_clauses = len(store)
+
+        offsets = np.frombuffer(store.offsets, dtype=np.int64)
+        flat = np.frombuffer(store.literals, dtype=np.int32)
+        lengths = np.diff(offsets)
+        width = int(lengths.max()) if len(lengths) else 1
+
+        literals = np.zeros((self.num_clauses, width), dtype=np.int32)
+        columns = np.arange(len(flat)) - np.repeat(offsets[:-1], lengths)
+        literals[np.repeat(np.arange(self.num_clauses), lengths), columns] = flat
+
+        self.mask = literals != 0
+        self.variables = np.abs(literals)
+        self.positive = literals > 0
+        # A clause with x and -x can never be unsatisfied or broken
+        negated = -literals[:, :, None] == literals[:, None, :]
+        self.tautology = (negated & self.mask[:, :, None]).any(axis=(1, 2))
+
+    def true_literals(self, assignment):
+        """(m x k) boolean array: which literals are true under assignment."""
+        return (assignment[self.variables] == self.positive) & self.mask
+
+    def score(self, assignment):
+        """Number of clauses satisfied by a boolean assignment array of length n + 1."""
+        return int(self.true_literals(assignment).any(axis=1).sum())
+
+    def flip_scores(self, assignment):
+        """
+        Scores the assignment and all of its one-flip neighbours.
+
+        Returns:
+            tuple: (satisfied count, array where entry v is the satisfied count
+                   after flipping variable v; entry 0 is unused).
+        """
+        true = self.true_literals(assignment)
+        count = true.sum(axis=1)
+        count[self.tautology] = 2
+        unsat = count == 0
+        critical = count == 1
+        size = self.num_variables + 1
+
+        make = np.bincount(self.variables[unsat][self.mask[unsat]], minlength=size)
+        breaks = np.bincount(self.variables[critical][true[critical]], minlength=size)
+        satisfied = self.num_clauses - int(unsat.sum())
+        return satisfied, satisfied + make - breaks
+
+    def batch_scores(self, assignments):
+        """
+        Scores many assignments at once.
+
+        Args:
+            assignments: (B x n + 1) boolean array, one assignment per row.
+
+        Returns:
+            numpy array of B satisfied-clause counts.
+        """
+        true = (assignments[:, self.variables] == self.positive) & self.mask
+        return true.any(axis=2).sum(axis=1)
+
+    def random_assignments(self, count, rng=None):
+        """(count x n + 1) array of random assignments, e.g. for batched restarts."""
+        rng = rng or np.random.default_rng(random.getrandbits(64))
+        return rng.random((count, self.num_variables + 1)) < 0.5
+
+
+class VectorizedScorer:
+    """
+    Holds one assignment over a VectorizedFormula.
+
+    It has the same interface as clause_index.ClauseIndex as used by
+    stochastic_hill_climbing: reset, num_satisfied, uphill_variables, flip
+    and assignment.
+    """
+    def __init__(self, clauses, num_variables, assignment=None):
+        self.formula = VectorizedFormula(clauses, num_variables)
+        self.num_variables = self.formula.num_variables
+        if assignment is None:
+            assignment = self.formula.random_assignments(1)[0]
+        self.reset(assignment)
+
+    def reset(self, assignment):
+        if isinstance(assignment, dict):
+            assignment = [False] + [assignment[v] for v in range(1, self.num_variables + 1)]
+        elif isinstance(assignment, (bytes, bytearray)):
+            assignment = np.frombuffer(assignment, dtype=np.uint8)
+        self.value = np.array(assignment, dtype=bool)
+        self._scores = None
+
+    def _evaluate(self):
+        if self._scores is None:
+            self._scores = self.formula.flip_scores(self.value)
+        return self._scores
+
+    def num_satisfied(self):
+        return self._evaluate()[0]
+
+    def uphill_variables(self):
+        """Variables whose flip satisfies more clauses than the current assignment."""
+        satisfied, neighbor_scores = self._evaluate()
+        return (np.flatnonzero(neighbor_scores[1:] > satisfied) + 1).tolist()
+
+    def flip(self, variable):
+        self.value[variable] = not self.value[variable]
+        self._scores = None
+
+    def assignment(self):
+        return {v: bool(self.value[v]) for v in range(1, self.num_variables + 1)}
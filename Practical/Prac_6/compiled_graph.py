@@ -0,0 +1,289 @@
+"""
+Compiled, array-backed AND-OR graphs for the Prac_6 AO* search.
+
+Compiling interns node names to ids 0 .. n - 1 and stores the graph in CSR
+form in flat typed arrays:
+
+- the AND groups of node v are group ids node_start[v] .. node_start[v + 1] - 1
+- the edges of group g are edge ids group_start[g] .. group_start[g + 1] - 1
+- edge e leads to node child[e] at cost weight[e]
+
+Heuristics are an array of doubles indexed by id. A node costs a few array
+slots plus its name, instead of dict entries, lists and (name, cost) tuples.
+
+Graphs can be compiled from the dict format of main.ao_star_search, or read
+record by record from an edge-list or JSON Lines file, so the dict form of a
+large graph never has to exist in memory.
+"""
+
+import json
+import math
+from array import array
+
+INF = float('inf')
+
+
+def check_number(graph, value, allow_inf=False):
+    """
+    Validates a weight or heuristic for graph (inf is allowed for heuristics
+    only) and clears graph.integral for a fractional one.
+
+    Raises:
+        ValueError: If value is NaN or an infinity that is not allowed.
+    """
+    if not -INF < value < INF and not (allow_inf and value == INF):
+        raise ValueError(f"Expected a finite number, got {value}")
+    if value != INF and value != int(value):
+        graph.integral = False
+    return value
+
+
+class CompiledGraph:
+    """An AND-OR graph in CSR form. Build one with GraphBuilder or the loaders below."""
+    def __init__(self):
+        self.names = []                 # id -> name
+        self.ids = {}                   # name -> id
+        self.inner = bytearray()        # 1 if the node has AND groups (is not a leaf)
+        self.h = array('d')             # heuristic; the cost of a leaf
+        self.node_start = array('i', [0])
+        self.group_start = array('i', [0])
+        self.child = array('i')
+        self.weight = array('d')
+        self.integral = True            # all weights and finite heuristics are ints
+
+    def __len__(self):
+        return len(self.names)
+
+    def groups(self, node):
+        """Group ids of the AND groups of node (an id)."""
+        return range(self.node_start[node], self.node_start[node + 1])
+
+    def edges(self, group):
+        """Edge ids of an AND group."""
+        return range(self.group_start[group], self.group_start[group + 1])
+
+    def to_dict(self):
+        """The graph and heuristics in the dict format of main.ao_star_search."""
+        names, child, weight = self.names, self.child, self.weight
+        number = int if self.integral else float
+        graph = {}
+        for v in range(len(names)):
+            if self.inner[v]:
+                graph[names[v]] = [[(names[child[e]], number(weight[e])) for e in self.edges(g)]
+                                   for g in self.groups(v)]
+        heuristics = {names[v]: number(self.h[v]) for v in range(len(names)) if self.h[v] != INF}
+        return graph, heuristics
+
+
+class GraphBuilder:
+    """
+    Collects nodes and edges in any order and compiles them into a CompiledGraph.
+
+    Edges are kept in typed arrays while reading. finish() sorts them into CSR
+    order with a counting sort, so building never holds per-edge Python objects.
+    """
+    def __init__(self):
+        self.graph = CompiledGraph()
+        self._h = array('d')            # NaN until a heuristic is given
+        self._group_ids = {}            # (parent id, group label) -> group number
+        self._group_parent = array('i')
+        self._edge_group = array('i')
+        self._edge_child = array('i')
+        self._edge_weight = array('d')
+
+    def intern(self, name):
+        """The id of name, adding the node if it is new."""
+        graph = self.graph
+        node = graph.ids.get(name)
+        if node is None:
+            node = graph.ids[name] = len(graph.names)
+            graph.names.append(name)
+            graph.inner.append(0)
+            self._h.append(math.nan)
+        return node
+
+    def _check_number(self, value, allow_inf=False):
+        return check_number(self.graph, value, allow_inf)
+
+    def add_heuristic(self, name, value):
+        self._h[self.intern(name)] = self._check_number(value, allow_inf=True)
+
+    def add_node(self, name, groups=None, h=None):
+        """
+        Adds a node in the dict format: groups is a list of AND groups of
+        (child, cost) pairs, appended to any groups the node already has. A
+        node given with a groups list (even an empty one) is an inner node.
+        """
+        node = self.intern(name)
+        if h is not None:
+            self._h[node] = self._check_number(h, allow_inf=True)
+        if groups is None:
+            return
+        self.graph.inner[node] = 1
+        # The hot path when compiling a dict graph, so intern() is inlined
+        ids, intern, check = self.graph.ids, self.intern, self._check_number
+        edge_group, edge_child, edge_weight = self._edge_group, self._edge_child, self._edge_weight
+        for and_group in groups:
+            group = len(self._group_parent)
+            self._group_parent.append(node)
+            for child, weight in and_group:
+                child_id = ids.get(child)
+                edge_group.append(group)
+                edge_child.append(intern(child) if child_id is None else child_id)
+                edge_weight.append(check(weight))
+
+    def add_edge(self, parent, label, child, weight):
+        """Adds an edge from parent to child in parent's AND group named label."""
+        node = self.intern(parent)
+        self.graph.inner[node] = 1
+        self._add_edge(self._group(node, label), child, weight)
+
+    def _group(self, node, label):
+        key = (node, label)
+        group = self._group_ids.get(key)
+        if group is None:
+            group = self._group_ids[key] = len(self._group_parent)
+            self._group_parent.append(node)
+        return group
+
+    def _add_edge(self, group, child, weight):
+        self._edge_group.append(group)
+        self._edge_child.append(self.intern(child))
+        self._edge_weight.append(self._check_number(weight))
+
+    def finish(self):
+        """Sorts the collected groups and edges into CSR order and returns the graph."""
+        graph = self.graph
+        n = len(graph.names)
+        num_groups = len(self._group_parent)
+
+        # Groups by parent, keeping the order in which each parent's groups appeared
+        node_start = array('i', bytes(4 * (n + 1)))
+        for parent in self._group_parent:
+            node_start[parent + 1] += 1
+        for v in range(n):
+            node_start[v + 1] += node_start[v]
+        group_parent, edge_group = self._group_parent, self._edge_group
+        if _is_sorted(group_parent) and _is_sorted(edge_group):
+            # Records arrived node by node (as from a dict or JSON Lines): no sort needed
+            position = range(num_groups)
+        else:
+            fill = array('i', node_start)
+            position = array('i', bytes(4 * num_groups))
+            for group, parent in enumerate(group_parent):
+                position[group] = fill[parent]
+                fill[parent] += 1
+
+        # Edges by (sorted) group, keeping their order within a group
+        group_start = array('i', bytes(4 * (num_groups + 1)))
+        for group in edge_group:
+            group_start[position[group] + 1] += 1
+        for g in range(num_groups):
+            group_start[g + 1] += group_start[g]
+        if isinstance(position, range):
+            child, weight = self._edge_child, self._edge_weight
+        else:
+            fill = array('i', group_start)
+            child = array('i', bytes(4 * len(edge_group)))
+            weight = array('d', bytes(8 * len(edge_group)))
+            for e, group in enumerate(edge_group):
+                slot = fill[position[group]]
+                fill[position[group]] += 1
+                child[slot] = self._edge_child[e]
+                weight[slot] = self._edge_weight[e]
+
+        # Missing heuristics: 0 for inner nodes, inf (unsolvable) for leaves
+        graph.h = array('d', (h if not math.isnan(h) else (0.0 if graph.inner[v] else INF)
+                              for v, h in enumerate(self._h)))
+        graph.node_start, graph.group_start = node_start, group_start
+        graph.child, graph.weight = child, weight
+        self.__init__()  # drop the build arrays; the builder can be reused
+        return graph
+
+
+def _is_sorted(values):
+    return all(a <= b for a, b in zip(values, values[1:]))
+
+
+def compile_graph(graph, heuristics):
+    """
+    Compiles an AND-OR graph in the dict format of main.ao_star_search.
+
+    Args:
+        graph (dict): {'Node': [[('Child1', cost1), ('Child2', cost2)], [('Child3', cost3)]]}
+        heuristics (dict): Heuristic cost of each node.
+
+    Returns:
+        CompiledGraph: The same graph in CSR form.
+    """
+    builder = GraphBuilder()
+    for name, groups in graph.items():
+        builder.add_node(name, groups)
+    for name, value in heuristics.items():
+        builder.add_heuristic(name, value)
+    return builder.finish()
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def load_edge_list(path):
+    """
+    Reads a graph from a whitespace-separated text file, one record per line:
+
+        parent group child cost   an edge in AND group `group` of parent
+        node h                    the heuristic of node
+
+    Blank lines and lines starting with '#' are skipped. Node names and
+    group labels are strings; the edges of a group need not be adjacent.
+
+    Returns:
+        CompiledGraph: The graph.
+    """
+    builder = GraphBuilder()
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            if len(fields) == 4:
+                builder.add_edge(fields[0], fields[1], fields[2], _number(fields[3]))
+            elif len(fields) == 2:
+                builder.add_heuristic(fields[0], _number(fields[1]))
+            else:
+                raise ValueError(f"{path}:{line_number}: expected 2 or 4 fields, got {len(fields)}")
+    return builder.finish()
+
+
+def load_json(path):
+    """
+    Reads a graph from JSON.
+
+    JSON Lines files are read one node at a time, one object per line:
+        {"node": "A", "h": 5, "groups": [[["B", 1]], [["C", 1], ["D", 1]]]}
+    where "h" and "groups" are optional. Otherwise the file must be one object
+    {"graph": {...}, "heuristics": {...}} in the ao_star_search dict format,
+    which is loaded whole.
+
+    Returns:
+        CompiledGraph: The graph.
+    """
+    builder = GraphBuilder()
+    with open(path) as f:
+        first = f.readline()
+        try:
+            record = json.loads(first)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict) or 'node' not in record:
+            data = json.loads(first + f.read())
+            return compile_graph(data.get('graph', {}), data.get('heuristics', {}))
+        while record is not None:
+            builder.add_node(record['node'], record.get('groups'), record.get('h'))
+            line = f.readline()
+            while line and not line.strip():
+                line = f.readline()
+            record = json.loads(line) if line else None
+    return builder.finish()
@@ -1,115 +1,251 @@
-class Node:
-    """Represents a node in the AND-OR graph."""
-    def __init__(self, name, h_cost, is_solved=False):
-        self.name = name
-        self.h_cost = h_cost
-        self.is_solved = is_solved
-        self.parent = None
-        self.children = []
-
-def ao_star_search(graph, heuristics, start_node_name):
+from array import array
+
+from compiled_graph import INF, CompiledGraph, compile_graph
+
+class AOStar:
+    """
+    Iterative AO* over a compiled AND-OR graph (see compiled_graph.py).
+
+    Only the current best partial solution graph is expanded: the search
+    walks depth-first from the start node along each node's marked (cheapest)
+    AND group, expands the unexpanded nodes it reaches, and stops once the
+    start node is solved. Costs of shared subgraphs are kept once per node
+    and reused by every parent.
+
+    Cost revisions are done along the walk instead of up the whole graph
+    after every expansion. Each node on the walk carries a limit: the cost
+    it may reach before some ancestor's marked group stops being the best.
+    Ancestors are only revised at once when a limit is exceeded; otherwise
+    a node is revised when the walk returns to it. This keeps long chains
+    linear instead of quadratic.
+
+    Everything uses explicit stacks, so graph depth is not limited by
+    Python's recursion limit. An AND group that would close a cycle in the
+    marked graph is blocked (treated as cost inf), so cyclic graphs terminate.
+
+    Nodes are ids of the compiled graph; costs, marked groups and flags are
+    arrays indexed by id.
+    """
+    def __init__(self, graph, heuristics=None, verbose=False):
+        """
+        Args:
+            graph (CompiledGraph or dict): The AND-OR graph. A dict in the
+                ao_star_search format is compiled together with heuristics.
+            heuristics (dict): Cost estimates, for a dict graph. Leaves
+                without one are unsolvable; inner nodes without one estimate 0.
+            verbose (bool): Print each node as it is expanded.
+        """
+        if not isinstance(graph, CompiledGraph):
+            graph = compile_graph(graph, heuristics or {})
+        self.graph = graph
+        self.verbose = verbose
+        n = len(graph)
+        self.cost = array('d', graph.h)             # current cost estimate of each node
+        self.marked = array('i', [-1]) * n          # group id of the best AND group, -1 if none
+        # Leaves are solved from the start; solved also covers nodes whose cost is inf
+        self.solved = bytearray(1 - inner for inner in graph.inner)
+        self.expanded = bytearray(n)
+        self.blocked = {}     # node -> group ids of its AND groups that close a cycle
+        self.expansions = 0
+
+    def children(self, node):
+        """Nodes of the marked AND group of node, or () if it has none."""
+        group = self.marked[node]
+        if group < 0:
+            return ()
+        graph = self.graph
+        return graph.child[graph.group_start[group]:graph.group_start[group + 1]].tolist()
+
+    def _update(self, node):
+        """
+        Recomputes the cost, marked group and solved status of node from its children.
+
+        Returns:
+            The previously marked group (-1 if there was none).
+        """
+        graph, cost, solved = self.graph, self.cost, self.solved
+        group_start, child, weight = graph.group_start, graph.child, graph.weight
+        blocked = self.blocked.get(node, ()) if self.blocked else ()
+        best, mark, done = INF, -1, False
+        for group in range(graph.node_start[node], graph.node_start[node + 1]):
+            if group in blocked:
+                continue
+            total = 0
+            all_solved = True
+            for e in range(group_start[group], group_start[group + 1]):
+                total += cost[child[e]] + weight[e]
+                if not solved[child[e]]:
+                    all_solved = False
+            # On ties prefer a group that is already solved
+            if total < best or (total == best and all_solved and not done):
+                best, mark, done = total, group, all_solved
+        if best == INF:
+            mark, done = -1, True  # no way to solve node: resolved as unsolvable
+        old_mark = self.marked[node]
+        cost[node] = best
+        self.marked[node] = mark
+        solved[node] = done
+        return old_mark
+
+    def _slack(self, node, limit):
+        """How much the marked group of node may grow before it stops being the best."""
+        graph, cost = self.graph, self.cost
+        group_start, child, weight = graph.group_start, graph.child, graph.weight
+        blocked = self.blocked.get(node, ()) if self.blocked else ()
+        mark = self.marked[node]
+        total, second = INF, INF
+        for group in range(graph.node_start[node], graph.node_start[node + 1]):
+            if group in blocked:
+                continue
+            group_cost = 0
+            for e in range(group_start[group], group_start[group + 1]):
+                group_cost += cost[child[e]] + weight[e]
+            if group == mark:
+                total = group_cost
+            elif group_cost < second:
+                second = group_cost
+        return min(second, limit) - total
+
+    def _expand(self, node, ancestors):
+        """
+        Marks node as expanded.
+
+        AND groups that contain one of ancestors (the marked path from the
+        start node to node) would close a cycle and are blocked.
+        """
+        graph = self.graph
+        self.expansions += 1
+        if self.verbose:
+            print(f"Expanding node: {graph.names[node]}")
+        for group in graph.groups(node):
+            for e in graph.edges(group):
+                if graph.child[e] in ancestors:
+                    self.blocked.setdefault(node, set()).add(group)
+        self.expanded[node] = 1
+
+    def solve(self, start):
+        """
+        Runs AO* from start (a node name) until it is solved.
+
+        Returns:
+            float: The cost of start (inf if it cannot be solved).
+        """
+        start = self.graph.ids.get(start)
+        if start is None:
+            return INF
+        solved, expanded, cost, marked = self.solved, self.expanded, self.cost, self.marked
+        # The walk: frames are [node, marked children, next position, limit, slack]
+        stack = []
+        on_stack = set()
+        visited = set()
+
+        def push(node, limit):
+            slack = self._slack(node, limit) if marked[node] >= 0 else 0
+            stack.append([node, self.children(node), 0, limit, slack])
+            on_stack.add(node)
+            visited.add(node)
+
+        while not solved[start]:
+            if not stack:
+                visited.clear()
+                push(start, INF)
+            frame = stack[-1]
+            node, children, position = frame[0], frame[1], frame[2]
+            finished = False
+            if not expanded[node]:
+                self._expand(node, on_stack)
+            else:
+                while position < len(children) and (solved[children[position]] or (
+                        children[position] in visited and children[position] not in on_stack)):
+                    position += 1
+                frame[2] = position + 1
+                if position < len(children):
+                    child = children[position]
+                    if child not in on_stack:
+                        push(child, cost[child] + frame[4])
+                        continue
+                    # The marked group of node leads back onto the walk
+                    self.blocked.setdefault(node, set()).add(marked[node])
+                else:
+                    finished = True
+
+            # Revise node, and its ancestors if it went over its limit. The
+            # walk restarts at the lowest node whose marked group changed.
+            depth = len(stack) - 1
+            old_mark = self._update(node)
+            cut = depth if solved[node] or marked[node] != old_mark else None
+            while depth > 0 and cost[stack[depth][0]] > stack[depth][3]:
+                depth -= 1
+                above = stack[depth][0]
+                old_mark = self._update(above)
+                if solved[above] or marked[above] != old_mark:
+                    cut = depth
+            if cut is None:
+                if finished:
+                    stack.pop()
+                    on_stack.discard(node)
+                continue
+            node, limit = stack[cut][0], stack[cut][3]
+            for dropped in stack[cut:]:
+                on_stack.discard(dropped[0])
+                visited.discard(dropped[0])
+            del stack[cut:]
+            if not solved[node]:
+                push(node, limit)
+        return cost[start]
+
+    def solution_path(self, start):
+        """
+        The solution graph below start (a node name) in preorder, listing each
+        inner node once.
+
+        Leaves (nodes without a marked AND group) are left out, except start.
+        """
+        names, marked = self.graph.names, self.marked
+        path = []
+        seen = set()
+        stack = [self.graph.ids[start]]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            path.append(names[node])
+            stack.extend(reversed([child for child in self.children(node) if marked[child] >= 0]))
+        return path
+
+def ao_star_search(graph, heuristics, start_node_name, verbose=False):
     """
     Implements the AO* search algorithm to find the minimum cost solution graph.
 
+    The result is optimal when the heuristics never overestimate. See AOStar
+    for how the search proceeds and how cycles are handled.
+
     Args:
-        graph (dict): The AND-OR graph structure. 
+        graph (dict or CompiledGraph): The AND-OR graph structure. 
                       Format: {'Node': [[('Child1', cost1), ('Child2', cost2)], [('Child3', cost3)]]}
                       Inner lists represent AND conditions, outer list represents OR conditions.
-        heuristics (dict): A dictionary of heuristic costs for each node.
+                      A CompiledGraph (see compiled_graph.py) is searched as is.
+        heuristics (dict): A dictionary of heuristic costs for each node
+                           (unused for a CompiledGraph, which carries its own).
         start_node_name (str): The name of the starting node.
+        verbose (bool): Print each node as it is expanded.
 
     Returns:
         tuple or (None, None): A tuple containing the solution path and its cost,
                                or (None, None) if no solution is found.
     """
+    if verbose:
+        print("Starting AO* Search...")
+    search = AOStar(graph, heuristics, verbose)
+    final_cost = search.solve(start_node_name)
     
-    # Store computed costs and the solution graph
-    computed_costs = {}
-    solution_graph = {}
-    
-    def get_h_cost(node_name):
-        return heuristics.get(node_name, float('inf'))
-
-    def get_computed_cost(node_name):
-        return computed_costs.get(node_name, float('inf'))
-
-    def set_computed_cost(node_name, cost):
-        computed_costs[node_name] = cost
-
-    def get_min_cost_child_nodes(node_name):
-        """Finds the child/children with the minimum cost for a given OR node."""
-        min_cost = float('inf')
-        min_cost_nodes = []
-        
-        # graph[node_name] contains list of AND-connected node groups
-        for and_group in graph.get(node_name, []):
-            cost = 0
-            nodes = []
-            for child_name, weight in and_group:
-                cost += get_computed_cost(child_name) + weight
-                nodes.append(child_name)
-
-            if cost < min_cost:
-                min_cost = cost
-                min_cost_nodes = nodes
-        
-        return min_cost, min_cost_nodes
-
-    def ao_star_recursive(node_name):
-        """The recursive part of the AO* algorithm."""
-        print(f"Expanding node: {node_name}")
-
-        # Base case: if node is terminal (no children in graph), cost is its heuristic
-        if node_name not in graph:
-            set_computed_cost(node_name, get_h_cost(node_name))
-            return
-        
-        # This is an OR node, we need to find the minimum cost path
-        min_cost = float('inf')
-        min_cost_nodes = []
-
-        # Iterate over all AND-connected groups of children
-        for and_group in graph.get(node_name, []):
-            current_cost = 0
-            
-            # Recursively call ao_star for each child in the AND group
-            for child_name, weight in and_group:
-                if child_name not in computed_costs:
-                    ao_star_recursive(child_name)
-                current_cost += get_computed_cost(child_name) + weight
-
-            if current_cost < min_cost:
-                min_cost = current_cost
-                min_cost_nodes = [child for child, weight in and_group]
-        
-        # Update the cost and solution path for the current node
-        set_computed_cost(node_name, min_cost)
-        solution_graph[node_name] = min_cost_nodes
-
-
-    # --- Main execution starts here ---
-    print("Starting AO* Search...")
-    ao_star_recursive(start_node_name)
-    
-    # Reconstruct the final solution path from the solution_graph
-    solution_path = []
-    
-    def reconstruct_path(node_name):
-        solution_path.append(node_name)
-        if node_name in solution_graph and solution_graph[node_name]:
-            for child_node in solution_graph[node_name]:
-                 # Only branch if the child is not a leaf in the solution path
-                if child_node in solution_graph:
-                    reconstruct_path(child_node)
-    
-    reconstruct_path(start_node_name)
-    
-    final_cost = get_computed_cost(start_node_name)
-    
-    if final_cost == float('inf'):
+    if final_cost == INF:
         return None, None
+    if search.graph.integral:
+        final_cost = int(final_cost)
         
-    return solution_path, final_cost
+    return search.solution_path(start_node_name), final_cost
 
 
 # --- Example Usage ---
@@ -134,7 +270,7 @@ if __name__ == "__main__":
     
     start_node = 'A'
     
-    path, cost = ao_star_search(graph_structure, heuristics_map, start_node)
+    path, cost = ao_star_search(graph_structure, heuristics_map, start_node, verbose=True)
     
     if path:
         print(f"\nSolution found with cost: {cost}")
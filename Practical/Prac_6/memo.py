@@ -0,0 +1,229 @@
+"""
+Multi-query AO* with a shared, saveable cost memo.
+
+An AOStar keeps its costs, marked groups and solved flags between calls to
+solve(), so queries from many start nodes against one instance share every
+subproblem they have in common. Here that state is the memo:
+solve_queries answers a batch of start nodes against one memo, and
+save_memo / load_memo write it to disk and read it back, so a new process
+can start warm.
+
+Only results that do not depend on the start node are shared. On a cyclic
+graph AO* blocks the AND groups that lead back onto the current walk, and
+what it then concludes (a higher cost, or inf) holds for that start only:
+from another start the same group may be fine. So after each query the
+blocked groups are dropped, and every node whose cost was worked out this
+query from a blocked group, directly or through its children, goes back to
+its unexpanded state. What is left is what a query from any start would
+compute, so with heuristics that never overestimate each query gets the
+cost ao_star_search would give on its own.
+
+The file holds a header, then the memo arrays in little-endian binary:
+
+    header     magic, graph fingerprint, node count
+    cost       float64 per node
+    marked     int32 per node (-1: no marked group)
+    solved     one byte per node
+    expanded   one byte per node
+
+The fingerprint is a CRC of the compiled graph, so a memo is never applied to
+a graph whose nodes, edges, weights or heuristics differ from the one it was
+computed on.
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from compiled_graph import INF, GraphBuilder
+from main import AOStar
+
+MAGIC = b'AOM2'
+HEADER = struct.Struct('<4sII')
+
+
+def graph_fingerprint(graph):
+    """CRC32 over the names, structure, weights and heuristics of a compiled graph."""
+    crc = zlib.crc32('\0'.join(map(str, graph.names)).encode())
+    for data in (graph.inner, graph.h, graph.node_start, graph.group_start, graph.child, graph.weight):
+        crc = zlib.crc32(_little_endian(data), crc)
+    return crc
+
+
+def _little_endian(data):
+    if sys.byteorder == 'big' and isinstance(data, array) and data.itemsize > 1:
+        data = array(data.typecode, data)
+        data.byteswap()
+    return bytes(data)
+
+
+def _read_array(f, typecode, count):
+    data = array(typecode)
+    data.frombytes(f.read(count * data.itemsize))
+    if len(data) != count:
+        raise ValueError("Memo file is truncated")
+    if sys.byteorder == 'big' and data.itemsize > 1:
+        data.byteswap()
+    return data
+
+
+def save_memo(search, path):
+    """Writes the memo of an AOStar to path (blocked groups are not part of it)."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, graph_fingerprint(search.graph), len(search.graph)))
+        for data in (search.cost, search.marked, search.solved, search.expanded):
+            f.write(_little_endian(data))
+    os.replace(tmp_path, path)
+
+
+def load_memo(search, path):
+    """
+    Replaces the memo of an AOStar with the one saved in path.
+
+    Raises:
+        ValueError: If the file is not a memo, is truncated, or was saved for
+                    a different graph.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is truncated")
+        magic, fingerprint, n = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an AO* memo")
+        if n != len(search.graph) or fingerprint != graph_fingerprint(search.graph):
+            raise ValueError(f"{path} was saved for a different graph")
+        cost = _read_array(f, 'd', n)
+        marked = _read_array(f, 'i', n)
+        solved = bytearray(_read_array(f, 'B', n))
+        expanded = bytearray(_read_array(f, 'B', n))
+    search.cost, search.marked, search.solved, search.expanded = cost, marked, solved, expanded
+    search.blocked = {}
+
+
+def forget_cycle_results(search, solved_before):
+    """
+    Drops what the last query of an AOStar learned through blocked groups.
+
+    Every node with a blocked group is reset to its unexpanded state, and so
+    is every node that was not already solved before the query
+    (solved_before) and has a reset node among its children, since its cost
+    was computed from one. Then the blocked groups are cleared.
+    """
+    if not search.blocked:
+        return
+    graph, expanded = search.graph, search.expanded
+    child, group_start = graph.child, graph.group_start
+    # Parents of each node, over the nodes this query may have revised
+    parents = {}
+    for node in range(len(graph)):
+        if expanded[node] and not solved_before[node]:
+            for group in graph.groups(node):
+                for e in range(group_start[group], group_start[group + 1]):
+                    parents.setdefault(child[e], []).append(node)
+    stale = set(search.blocked)
+    stack = list(stale)
+    while stack:
+        for parent in parents.get(stack.pop(), ()):
+            if parent not in stale:
+                stale.add(parent)
+                stack.append(parent)
+    for node in stale:
+        search.cost[node] = graph.h[node]
+        search.marked[node] = -1
+        search.solved[node] = 1 - graph.inner[node]
+        search.expanded[node] = 0
+    search.blocked = {}
+
+
+def solve_queries(search, starts):
+    """
+    Answers many start nodes against the memo of one AOStar.
+
+    After each query the memo keeps only start-independent results (see
+    forget_cycle_results).
+
+    Returns:
+        dict: start -> (solution path, cost), or (None, None) when a start has
+              no solution. With heuristics that never overestimate the costs
+              are those ao_star_search gives one by one; with others AO*
+              depends on the order of expansion, and the memo may lead
+              to a cheaper solution.
+    """
+    results = {}
+    for start in starts:
+        solved_before = bytes(search.solved)
+        cost = search.solve(start)
+        if cost == INF:
+            results[start] = (None, None)
+        else:
+            results[start] = (search.solution_path(start), int(cost) if search.graph.integral else cost)
+        forget_cycle_results(search, solved_before)
+    return results
+
+
+def ao_star_queries(graph, heuristics, starts, memo_path=None):
+    """
+    Answers many start nodes of one AND-OR graph, reusing a memo file if given.
+
+    Args:
+        graph (dict or CompiledGraph): The AND-OR graph, as for ao_star_search.
+        heuristics (dict): Heuristic costs, for a dict graph.
+        starts (iterable): Start node names.
+        memo_path (str): Memo file loaded before the queries (if it exists and
+                         matches the graph) and saved after them.
+
+    Returns:
+        dict: start -> (solution path, cost), or (None, None).
+    """
+    search = AOStar(graph, heuristics)
+    if memo_path and os.path.exists(memo_path):
+        try:
+            load_memo(search, memo_path)
+        except ValueError:
+            pass  # stale or foreign memo: start cold and overwrite it
+    results = solve_queries(search, starts)
+    if memo_path:
+        save_memo(search, memo_path)
+    return results
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    import random
+
+    # A layered graph: each node of a layer has two AND groups over nodes of
+    # the next layer, so queries from different starts share most subproblems
+    random.seed(0)
+    layers, width = 30, 100
+    builder = GraphBuilder()
+    for layer in range(layers):
+        for i in range(width):
+            pick = lambda: f"n{layer + 1}_{random.randrange(width)}"
+            builder.add_node(f"n{layer}_{i}", [[(pick(), random.randint(1, 9)), (pick(), random.randint(1, 9))],
+                                               [(pick(), random.randint(1, 20))]])
+    for i in range(width):
+        builder.add_heuristic(f"n{layers}_{i}", random.randint(0, 5))
+    graph = builder.finish()
+    starts = [f"n0_{i}" for i in range(0, width, 10)]
+    memo_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ao_memo.bin')
+
+    begin = time.time()
+    one_by_one = {start: AOStar(graph).solve(start) for start in starts}
+    print(f"{len(starts)} separate searches: {time.time() - begin:.2f}s")
+
+    begin = time.time()
+    shared = ao_star_queries(graph, None, starts, memo_file)
+    print(f"One shared memo: {time.time() - begin:.2f}s")
+
+    begin = time.time()
+    warm = ao_star_queries(graph, None, starts, memo_file)
+    print(f"Warm start from {memo_file} ({os.path.getsize(memo_file)} bytes): {time.time() - begin:.2f}s")
+    assert all(shared[s][1] == warm[s][1] == one_by_one[s] for s in starts)
+    os.remove(memo_file)
+
@@ -0,0 +1,55 @@
+"""
+Checks that a shared AO* memo answers each query like a separate search.
+
+On cyclic graphs AO* blocks AND groups that lead back onto its walk; what it
+concludes from them holds for one start node only and must not leak into the
+memo used by later queries.
+
+    python -m pytest test_memo.py
+"""
+
+import random
+
+from main import ao_star_search
+from memo import ao_star_queries
+
+
+def random_cyclic_graph(rng):
+    """A small graph whose AND groups may point back at any inner node, with exact leaf costs."""
+    nodes = [f"c{i}" for i in range(rng.randint(2, 9))]
+    leaves = ['L0', 'L1', 'L2']
+    graph = {v: [[(rng.choice(nodes + leaves), rng.randint(1, 5)) for _ in range(rng.randint(1, 2))]
+                 for _ in range(rng.randint(1, 3))]
+             for v in nodes}
+    # Inner nodes estimate 0, so the heuristic never overestimates
+    leaf_costs = {leaf: rng.randint(0, 6) for leaf in leaves if rng.random() < 0.8}
+    return graph, leaf_costs, nodes
+
+
+def test_blocked_group_does_not_leak_to_next_start():
+    graph = {'A': [[('B', 1)]], 'B': [[('A', 3)], [('Y', 1)]]}
+    heuristics = {'X': 0, 'Y': 3}
+    assert ao_star_search(graph, heuristics, 'A') == (['A', 'B'], 5)
+    assert ao_star_queries(graph, heuristics, ['B', 'A']) == {'B': (['B'], 4), 'A': (['A', 'B'], 5)}
+
+
+def test_shared_memo_matches_separate_searches_on_cyclic_graphs():
+    rng = random.Random(0)
+    for _ in range(500):
+        graph, leaf_costs, nodes = random_cyclic_graph(rng)
+        starts = [rng.choice(nodes) for _ in range(4)]
+        shared = ao_star_queries(graph, leaf_costs, starts)
+        for start in starts:
+            assert shared[start] == ao_star_search(graph, leaf_costs, start), (graph, starts, start)
+
+
+def test_saved_memo_matches_separate_searches(tmp_path):
+    rng = random.Random(1)
+    for trial in range(100):
+        graph, leaf_costs, nodes = random_cyclic_graph(rng)
+        memo_file = str(tmp_path / f"memo{trial}.bin")
+        ao_star_queries(graph, leaf_costs, [rng.choice(nodes) for _ in range(3)], memo_file)
+        starts = [rng.choice(nodes) for _ in range(3)]
+        warm = ao_star_queries(graph, leaf_costs, starts, memo_file)
+        for start in starts:
+            assert warm[start] == ao_star_search(graph, leaf_costs, start), (graph, starts, start)
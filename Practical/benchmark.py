@@ -0,0 +1,536 @@
+"""
+Benchmark suite for the search and SAT solvers of the practicals.
+
+Every run works on seeded, generated instance sets, so two runs with the same
+seed time exactly the same problems:
+
+    eight      solvable 8-puzzles drawn uniformly from each optimal-depth bin
+               (the depths come from one backward BFS over all 181,440 boards)
+    fifteen    15-puzzles from random walks, binned by their optimal depth
+    sat        random 3-SAT at 4.26 clauses per variable, keeping the
+               satisfiable ones (checked with the CDCL solver)
+    and_or     random layered AND-OR graphs with admissible heuristics, whose
+               optimal cost is known from a bottom-up pass
+
+For each solver and bin it reports wall time, nodes expanded per second (when
+the solver counts them), the tracemalloc peak and solution quality. Quality is
+1.0 at best: optimal / found cost for the puzzles and AND-OR graphs, and the
+fraction of clauses satisfied by the best assignment for SAT. A SAT run only
+counts as solved when every clause is satisfied; the fraction still shows how
+close a failed run came.
+
+Results can be written as JSON and compared against an earlier file, so a
+slowdown or a drop in quality shows up as a regression:
+
+    python benchmark.py --output base.json
+    python benchmark.py --baseline base.json      # exits with 1 on a regression
+
+The solvers are loaded by file path with importlib, since several practicals
+use the same module names (main.py, solution.py).
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from search_stats import SearchStats
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Module names used by more than one practical
+_SHARED_NAMES = ('main', 'solution')
+
+_eight_depths = None
+
+
+def load_module(practical, name):
+    """
+    Imports practical/name.py under the unique name '<practical>_<name>'.
+
+    The practical's directory is put on sys.path while the module runs, so
+    its own sibling imports resolve; main/solution modules of other
+    practicals are kept out of the way.
+    """
+    unique = f"{practical.lower()}_{name}"
+    if unique in sys.modules:
+        return sys.modules[unique]
+    directory = os.path.join(HERE, practical)
+    saved = {shared: sys.modules.pop(shared) for shared in _SHARED_NAMES if shared in sys.modules}
+    sys.path.insert(0, directory)
+    try:
+        spec = importlib.util.spec_from_file_location(unique, os.path.join(directory, name + '.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[unique] = module
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(directory)
+        for shared in _SHARED_NAMES:
+            sys.modules.pop(shared, None)
+        sys.modules.update(saved)
+    return module
+
+
+# --- Instance generators ---
+
+def _bin_name(low, high):
+    return f"{low}-{high}"
+
+
+def _neighbors(size):
+    cells = []
+    for i in range(size * size):
+        row, col = divmod(i, size)
+        cells.append([r * size + c for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                      if 0 <= r < size and 0 <= c < size])
+    return cells
+
+
+def _rows(board, size):
+    return tuple(tuple(board[r * size:(r + 1) * size]) for r in range(size))
+
+
+def eight_puzzle_depths():
+    """Optimal depth of every solvable 8-puzzle, as {flat board: depth}; computed once."""
+    global _eight_depths
+    if _eight_depths is None:
+        adjacency = _neighbors(3)
+        goal = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+        depths = {goal: 0}
+        queue = deque([(goal, 8)])
+        while queue:
+            board, blank = queue.popleft()
+            depth = depths[board] + 1
+            for target in adjacency[blank]:
+                moved = list(board)
+                moved[blank], moved[target] = moved[target], 0
+                moved = tuple(moved)
+                if moved not in depths:
+                    depths[moved] = depth
+                    queue.append((moved, target))
+        _eight_depths = depths
+    return _eight_depths
+
+
+def eight_puzzles(rng, bins, per_bin):
+    """
+    Draws per_bin boards uniformly from each (low, high) optimal-depth bin.
+
+    Returns:
+        list of dict: {'bin', 'state' (tuple of rows), 'optimal'}.
+    """
+    by_depth = {}
+    for board, depth in eight_puzzle_depths().items():
+        by_depth.setdefault(depth, []).append(board)
+    instances = []
+    for low, high in bins:
+        pool = [board for depth in range(low, high + 1) for board in by_depth.get(depth, ())]
+        for board in rng.sample(pool, min(per_bin, len(pool))):
+            instances.append({'bin': _bin_name(low, high), 'state': _rows(board, 3),
+                              'optimal': eight_puzzle_depths()[board]})
+    return instances
+
+
+def fifteen_puzzles(rng, bins, per_bin, optimal_moves, max_tries=200):
+    """
+    Random walks from the 15-puzzle goal, kept when their optimal depth falls
+    in a bin that still needs instances.
+
+    Args:
+        optimal_moves (callable): Returns an optimal move list for a state.
+    """
+    adjacency = _neighbors(4)
+    instances = []
+    for low, high in bins:
+        found = 0
+        for _ in range(max_tries):
+            if found == per_bin:
+                break
+            board = list(range(1, 16)) + [0]
+            blank, previous = 15, None
+            for _ in range(rng.randint(low, 2 * high)):
+                target = rng.choice([cell for cell in adjacency[blank] if cell != previous])
+                board[blank], board[target] = board[target], 0
+                blank, previous = target, blank
+            state = _rows(board, 4)
+            depth = len(optimal_moves(state))
+            if low <= depth <= high:
+                instances.append({'bin': _bin_name(low, high), 'state': state, 'optimal': depth})
+                found += 1
+    return instances
+
+
+def random_3sat(rng, num_variables, ratio=4.26):
+    """A random 3-SAT formula with round(ratio * num_variables) clauses of distinct variables."""
+    return [[v if rng.random() < 0.5 else -v for v in rng.sample(range(1, num_variables + 1), 3)]
+            for _ in range(round(ratio * num_variables))]
+
+
+def sat_instances(rng, sizes, per_size, is_satisfiable, max_tries=50):
+    """Satisfiable random 3-SAT formulas near the phase transition, per_size for each size."""
+    instances = []
+    for n in sizes:
+        found = 0
+        for _ in range(max_tries):
+            if found == per_size:
+                break
+            clauses = random_3sat(rng, n)
+            if is_satisfiable(clauses, n):
+                instances.append({'bin': f"n={n}", 'clauses': clauses, 'num_variables': n})
+                found += 1
+    return instances
+
+
+def layered_and_or(rng, layers, width):
+    """
+    A random AND-OR graph: a root over layers of width nodes each, every inner
+    node having 1-3 OR options of 1-3 AND children in the next layer. The last
+    layer holds the leaves.
+
+    Returns:
+        tuple: (graph, heuristics, start, optimal cost) in the format of
+               Prac_6's ao_star_search. Inner heuristics are a random fraction
+               of the optimal cost, so they never overestimate.
+    """
+    names = [['root']] + [[f"n{layer}_{i}" for i in range(width)] for layer in range(1, layers + 1)]
+    graph = {}
+    for layer in range(layers):
+        below = names[layer + 1]
+        for name in names[layer]:
+            graph[name] = [[(rng.choice(below), rng.randint(1, 9)) for _ in range(rng.randint(1, 3))]
+                           for _ in range(rng.randint(1, 3))]
+    best = {name: rng.randint(0, 9) for name in names[-1]}
+    heuristics = dict(best)
+    for layer in range(layers - 1, -1, -1):
+        for name in names[layer]:
+            best[name] = min(sum(best[child] + weight for child, weight in group) for group in graph[name])
+            heuristics[name] = int(best[name] * rng.random())
+    return graph, heuristics, 'root', best['root']
+
+
+def and_or_instances(rng, shapes, per_shape):
+    instances = []
+    for layers, width in shapes:
+        for _ in range(per_shape):
+            graph, heuristics, start, optimal = layered_and_or(rng, layers, width)
+            instances.append({'bin': f"{layers}x{width}", 'graph': graph, 'heuristics': heuristics,
+                              'start': start, 'optimal': optimal})
+    return instances
+
+
+# --- Solvers ---
+# A runner takes an instance and returns (solved, quality, nodes), with
+# quality None when there is nothing to grade and nodes None when the solver
+# does not count them. The puzzle searches report expanded nodes through
+# SearchStats.
+
+def _puzzle_quality(instance, length):
+    if length is None:
+        return False, None
+    return True, instance['optimal'] / length if length else 1.0
+
+
+def _node_path_length(node):
+    """Moves in the Node chain returned by the Prac_1 searches, None if no node."""
+    if node is None:
+        return None
+    length = 0
+    while node.parent is not None:
+        node, length = node.parent, length + 1
+    return length
+
+
+def _goal_bytes(size):
+    return bytes(list(range(1, size * size)) + [0])
+
+
+def run_bfs(instance):
+    solution = load_module('Prac_1', 'solution')
+    moves = solution.build_move_table(3, 3)
+    stats = SearchStats()
+    node = solution.breadth_first_search(solution.encode(instance['state']), _goal_bytes(3), moves, stats)
+    return (*_puzzle_quality(instance, _node_path_length(node)), stats.expanded)
+
+
+def run_bidirectional(instance):
+    solution = load_module('Prac_1', 'solution')
+    moves = solution.build_move_table(3, 3)
+    stats = SearchStats()
+    node = solution.bidirectional_search(solution.encode(instance['state']), _goal_bytes(3), moves, stats)
+    return (*_puzzle_quality(instance, _node_path_length(node)), stats.expanded)
+
+
+def run_dfid(instance):
+    solution = load_module('Prac_2', 'solution')
+    size = len(instance['state'])
+    goal = _rows(_goal_bytes(size), size)
+    stats = SearchStats()
+    result = solution.iterative_deepening_search(instance['state'], goal, transposition=True, stats=stats)
+    return (*_puzzle_quality(instance, len(result.path) - 1 if result.found else None), stats.expanded)
+
+
+def run_astar(instance):
+    main = load_module('prac_5', 'main')
+    stats = SearchStats()
+    moves = main.solve_8_puzzle(instance['state'], stats=stats)
+    return (*_puzzle_quality(instance, None if moves is None else len(moves)), stats.expanded)
+
+
+def run_ida_star(instance):
+    ida_star = load_module('prac_5', 'ida_star')
+    moves = ida_star.solve_ida_star(instance['state'])
+    return (*_puzzle_quality(instance, None if moves is None else len(moves)), None)
+
+
+def _sat_quality(stats, clauses, solution):
+    """Solved only if every clause is satisfied; quality is the satisfied fraction."""
+    if solution is not None:
+        return True, 1.0
+    return False, stats.best_score / len(clauses)
+
+
+def run_hill_climbing(instance):
+    main = load_module('Prac_4', 'main')
+    stats = main.SolverStats()
+    solution = main.stochastic_hill_climbing(instance['clauses'], instance['num_variables'],
+                                             max_restarts=20, max_steps=1000, stats=stats)
+    return (*_sat_quality(stats, instance['clauses'], solution), stats.flips)
+
+
+def run_walksat(instance):
+    main = load_module('Prac_4', 'main')
+    stats = main.SolverStats()
+    solution = main.walksat(instance['clauses'], instance['num_variables'],
+                            max_restarts=10, max_flips=20000, stats=stats)
+    return (*_sat_quality(stats, instance['clauses'], solution), stats.flips)
+
+
+def run_cdcl(instance):
+    cdcl = load_module('Prac_4', 'cdcl')
+    solver = cdcl.CDCLSolver(instance['clauses'], instance['num_variables'])
+    status, _ = solver.solve()
+    if status != cdcl.SAT:
+        return False, None, solver.decisions
+    return True, 1.0, solver.decisions
+
+
+def run_ao_star(instance):
+    main = load_module('Prac_6', 'main')
+    search = main.AOStar(instance['graph'], instance['heuristics'])
+    cost = search.solve(instance['start'])
+    if cost == float('inf'):
+        return False, None, search.expansions
+    return True, (instance['optimal'] / cost if cost else 1.0), search.expansions
+
+
+# suite -> [(solver name, runner, deepest bin it is run on or None for all)]
+SOLVERS = {
+    'eight': [('bfs', run_bfs, None), ('bidirectional', run_bidirectional, None),
+              ('dfid', run_dfid, 15), ('astar', run_astar, None), ('ida_star', run_ida_star, None)],
+    'fifteen': [('astar', run_astar, 19), ('ida_star', run_ida_star, None)],
+    'sat': [('hill_climbing', run_hill_climbing, None), ('walksat', run_walksat, None),
+            ('cdcl', run_cdcl, None)],
+    'and_or': [('ao_star', run_ao_star, None)],
+}
+
+# Instance set sizes: full run and --quick run
+SIZES = {
+    'eight': ({'bins': [(0, 7), (8, 15), (16, 23), (24, 31)], 'per_bin': 3},
+              {'bins': [(0, 7), (8, 15), (16, 23)], 'per_bin': 2}),
+    'fifteen': ({'bins': [(8, 13), (14, 19), (20, 25)], 'per_bin': 3},
+                {'bins': [(8, 13), (14, 19)], 'per_bin': 2}),
+    'sat': ({'sizes': [50, 100, 150], 'per_size': 3}, {'sizes': [50, 100], 'per_size': 2}),
+    'and_or': ({'shapes': [(8, 20), (16, 100), (32, 300)], 'per_shape': 3},
+               {'shapes': [(8, 20), (16, 100)], 'per_shape': 2}),
+}
+
+
+def generate(suite, rng, quick=False):
+    """The instance set of a suite, drawn from rng."""
+    size = SIZES[suite][1 if quick else 0]
+    if suite == 'eight':
+        return eight_puzzles(rng, size['bins'], size['per_bin'])
+    if suite == 'fifteen':
+        ida_star = load_module('prac_5', 'ida_star')
+        return fifteen_puzzles(rng, size['bins'], size['per_bin'], ida_star.solve_ida_star)
+    if suite == 'sat':
+        cdcl = load_module('Prac_4', 'cdcl')
+        return sat_instances(rng, size['sizes'], size['per_size'],
+                             lambda clauses, n: cdcl.cdcl_solve(clauses, n)[0] == cdcl.SAT)
+    if suite == 'and_or':
+        return and_or_instances(rng, size['shapes'], size['per_shape'])
+    raise ValueError(f"Unknown suite: {suite}")
+
+
+# --- Measuring ---
+
+def measure(runner, instance, seed, repeat=1, trace_memory=True):
+    """
+    Times one solver run on one instance.
+
+    The solver's own randomness is reseeded before every run. The time is the
+    best of repeat runs; the memory peak comes from one extra run under
+    tracemalloc, so tracing does not slow down the timed runs.
+
+    Returns:
+        dict: {'time', 'solved', 'quality', 'nodes', 'peak'} (peak in bytes, or None).
+    """
+    best = None
+    for _ in range(repeat):
+        random.seed(seed)
+        start = time.perf_counter()
+        solved, quality, nodes = runner(instance)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if trace_memory:
+        random.seed(seed)
+        tracemalloc.start()
+        try:
+            runner(instance)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {'time': best, 'solved': solved, 'quality': quality, 'nodes': nodes, 'peak': peak}
+
+
+def summarize(suite, solver, group, runs):
+    """Aggregates the runs of one solver on one bin into a result record."""
+    total = sum(run['time'] for run in runs)
+    graded = [run['quality'] for run in runs if run['quality'] is not None]
+    nodes = None if any(run['nodes'] is None for run in runs) else sum(run['nodes'] for run in runs)
+    peaks = [run['peak'] for run in runs if run['peak'] is not None]
+    return {
+        'suite': suite, 'solver': solver, 'bin': group, 'instances': len(runs),
+        'time_total': total, 'time_mean': total / len(runs),
+        'nodes': nodes, 'nodes_per_sec': nodes / total if nodes is not None and total > 0 else None,
+        'peak_kib': max(peaks) / 1024 if peaks else None,
+        'solved': sum(1 for run in runs if run['solved']) / len(runs),
+        'quality': sum(graded) / len(graded) if graded else 0.0,
+    }
+
+
+def run_suites(suites, seed=0, quick=False, repeat=1, trace_memory=True, log=print):
+    """
+    Generates and runs the given suites.
+
+    Returns:
+        list of dict: One result record per (suite, solver, bin), see summarize.
+    """
+    results = []
+    for suite in suites:
+        instances = generate(suite, random.Random(f"{seed}:{suite}"), quick)
+        if not instances:
+            if log:
+                log(f"{suite}: no instances, skipped")
+            continue
+        groups = {}
+        for number, instance in enumerate(instances):
+            groups.setdefault(instance['bin'], []).append((number, instance))
+        for solver, runner, deepest in SOLVERS[suite]:
+            # Untimed warm-up: imports and caches are not charged to the first bin
+            random.seed(seed)
+            runner(instances[0])
+            for group, members in groups.items():
+                if deepest is not None and max(i.get('optimal', 0) for _, i in members) > deepest:
+                    continue
+                runs = [measure(runner, instance, seed * 100003 + number, repeat, trace_memory)
+                        for number, instance in members]
+                record = summarize(suite, solver, group, runs)
+                results.append(record)
+                if log:
+                    log(format_record(record))
+    return results
+
+
+def format_record(record):
+    nodes = f"{record['nodes_per_sec']:>10.0f}" if record['nodes_per_sec'] is not None else f"{'-':>10}"
+    peak = f"{record['peak_kib']:>9.0f}" if record['peak_kib'] is not None else f"{'-':>9}"
+    return (f"{record['suite']:<8} {record['solver']:<14} {record['bin']:<8} "
+            f"{1000 * record['time_mean']:>10.1f} {nodes} {peak} "
+            f"{record['solved']:>6.0%} {record['quality']:>7.3f}")
+
+
+HEADER = (f"{'suite':<8} {'solver':<14} {'bin':<8} {'ms/inst':>10} {'nodes/s':>10} {'peak KiB':>9} "
+          f"{'solved':>6} {'quality':>7}")
+
+
+def compare(results, baseline, tolerance=0.25, min_time=0.005):
+    """
+    Compares results against baseline results.
+
+    A record regresses when its mean time grew by more than tolerance (only
+    checked when either time is at least min_time seconds, since shorter ones
+    are mostly noise), or when it solved fewer instances or found worse
+    solutions. Records missing from either side are ignored.
+
+    Returns:
+        list of str: One message per regression.
+    """
+    old = {(r['suite'], r['solver'], r['bin']): r for r in baseline}
+    regressions = []
+    for record in results:
+        key = (record['suite'], record['solver'], record['bin'])
+        before = old.get(key)
+        if before is None:
+            continue
+        name = '/'.join(key)
+        if max(record['time_mean'], before['time_mean']) >= min_time and \
+                record['time_mean'] > before['time_mean'] * (1 + tolerance):
+            regressions.append(f"{name}: {1000 * before['time_mean']:.1f} -> "
+                               f"{1000 * record['time_mean']:.1f} ms per instance")
+        if record['solved'] < before['solved']:
+            regressions.append(f"{name}: solved {before['solved']:.0%} -> {record['solved']:.0%}")
+        if record['quality'] < before['quality'] - 1e-9:
+            regressions.append(f"{name}: quality {before['quality']:.3f} -> {record['quality']:.3f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--suite', action='append', choices=sorted(SOLVERS),
+                        help="suite to run (repeatable; default: all)")
+    parser.add_argument('--seed', type=int, default=0, help="instance and solver seed")
+    parser.add_argument('--quick', action='store_true', help="smaller instance sets")
+    parser.add_argument('--repeat', type=int, default=1, help="timed runs per instance (best is kept)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc runs")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown against the baseline (default 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    print(HEADER)
+    results = run_suites(args.suite or list(SOLVERS), args.seed, args.quick, args.repeat, not args.no_memory)
+    if args.output:
+        report = {
+            'seed': args.seed, 'quick': args.quick, 'repeat': args.repeat,
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('seed') != args.seed or baseline.get('quick') != args.quick:
+            print("\nWarning: the baseline was run on a different instance set")
+        regressions = compare(results, baseline['results'], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for message in regressions:
+                print("  " + message)
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Exact distance table for the 8-puzzle.
+
+Only 181,440 boards can reach the goal, so a single backward BFS from the
+goal used by main.py records the optimal distance of every one of them. The
+table is indexed by the board's permutation rank (a perfect hash over all 9!
+arrangements), holds one byte per entry, and is memory-mapped when loaded.
+
+Answering a query needs no search: from the start board, repeatedly slide
+the blank to any neighbour whose stored distance is one less.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from collections import deque
+
+from npuzzle import MOVES, make_goal, flatten
+from pattern_db import DEFAULT_DIRECTORY, UNREACHED, neighbor_cells, rank, rank_weights, table_size
+
+MAGIC = b'DOR1'
+HEADER = struct.Struct('<4sB')
+
+# (row delta, col delta) of the blank -> move name
+_MOVE_NAMES = {delta: name for name, delta in MOVES.items()}
+
+# One byte per permutation: 9! bytes for the 8-puzzle, but 16! (about 21
+# terabytes) for the 15-puzzle, so larger boards are refused up front
+MAX_SIZE = 3
+
+_loaded = {}
+
+
+def build_table(size=3):
+    """
+    Runs a backward BFS from the goal over every reachable board.
+
+    Returns:
+        bytearray: Optimal distance indexed by permutation rank, or 255 for
+                   boards of the other parity.
+
+    Raises:
+        ValueError: If size is not 2 .. MAX_SIZE; larger tables would not fit.
+    """
+    if not 2 <= size <= MAX_SIZE:
+        raise ValueError(f"an exact table for {size}x{size} boards is not feasible; use size 2 or 3")
+    num_cells = size * size
+    weights = rank_weights(num_cells, num_cells)
+    adjacency = neighbor_cells(size)
+    table = bytearray([UNREACHED]) * table_size(num_cells, num_cells)
+
+    goal = flatten(make_goal(size))
+    table[rank(goal, weights)] = 0
+    queue = deque([(goal, num_cells - 1)])
+    while queue:
+        board, blank = queue.popleft()
+        depth = table[rank(board, weights)] + 1
+        for target in adjacency[blank]:
+            moved = list(board)
+            moved[blank], moved[target] = moved[target], 0
+            moved = tuple(moved)
+            index = rank(moved, weights)
+            if table[index] == UNREACHED:
+                table[index] = depth
+                queue.append((moved, target))
+    return table
+
+
+def table_path(size=3, directory=None):
+    return os.path.join(directory or DEFAULT_DIRECTORY, 'oracle%d.bin' % size)
+
+
+def build(size=3, directory=None):
+    """Builds the table and writes it to disk, returning the file path."""
+    path = table_path(size, directory)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, size))
+        f.write(build_table(size))
+    os.replace(tmp_path, path)
+    return path
+
+
+class DistanceOracle:
+    """Memory-mapped distance table answering optimal-solution queries by lookup."""
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a distance oracle")
+        num_cells = self.size * self.size
+        if len(self.data) != HEADER.size + table_size(num_cells, num_cells):
+            raise ValueError(f"{path} is truncated")
+        self.weights = rank_weights(num_cells, num_cells)
+        self.adjacency = neighbor_cells(self.size)
+
+    def _distance(self, board):
+        return self.data[HEADER.size + rank(board, self.weights)]
+
+    def distance(self, state):
+        """
+        Returns the optimal number of moves to the goal, or None if unsolvable.
+
+        Args:
+            state (tuple of tuples): The puzzle configuration.
+        """
+        d = self._distance(flatten(state))
+        return None if d == UNREACHED else d
+
+    def solve(self, state):
+        """
+        Returns an optimal list of moves for state, or None if unsolvable.
+
+        Each step slides the blank to a neighbour one move closer to the goal.
+        """
+        board = list(flatten(state))
+        d = self._distance(board)
+        if d == UNREACHED:
+            return None
+        size = self.size
+        blank = board.index(0)
+        path = []
+        while d > 0:
+            for target in self.adjacency[blank]:
+                board[blank], board[target] = board[target], 0
+                if self._distance(board) == d - 1:
+                    break
+                board[target], board[blank] = board[blank], 0
+            dr, dc = divmod(target, size)
+            br, bc = divmod(blank, size)
+            path.append(_MOVE_NAMES[(dr - br, dc - bc)])
+            blank = target
+            d -= 1
+        return path
+
+
+def load(size=3, directory=None, build_missing=False):
+    """
+    Memory-maps the oracle for a board size, building it first if asked.
+
+    Raises:
+        FileNotFoundError: If the table is missing and build_missing is False.
+    """
+    key = (size, directory)
+    if key in _loaded:
+        return _loaded[key]
+    path = table_path(size, directory)
+    if not os.path.exists(path):
+        if not build_missing:
+            raise FileNotFoundError(
+                f"{path} not found; build it with: python distance_oracle.py {size}")
+        build(size, directory)
+    _loaded[key] = DistanceOracle(path)
+    return _loaded[key]
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    # Build the table, e.g. `python distance_oracle.py 3` (sizes 2 and 3 only)
+    board_size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    examples = {2: ((0, 3), (2, 1)), 3: ((7, 2, 4), (5, 0, 6), (8, 3, 1))}
+    if board_size not in examples:
+        sys.exit(f"Board size must be 2 or 3, not {board_size}: larger tables do not fit in memory or on disk")
+    print("Wrote", build(board_size))
+
+    oracle = load(board_size)
+    initial_state_tuple = examples[board_size]
+    solution_path = oracle.solve(initial_state_tuple)
+    if solution_path is not None:
+        print(f"Solution found in {len(solution_path)} moves!")
+        print("Path:", " -> ".join(solution_path))
+    else:
+        print("No solution found. The puzzle is unsolvable.")
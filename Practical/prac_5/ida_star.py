@@ -0,0 +1,97 @@
+"""
+Iterative-deepening A* (IDA*) for N x N sliding-tile puzzles.
+
+IDA* runs a series of depth-first searches, each cut off once g + h exceeds
+a bound, and raises the bound to the smallest f that was cut off. Only the
+current path is kept, so memory grows with the solution depth rather than
+with the number of states seen, which is what makes 15-puzzles tractable.
+"""
+
+import pattern_db
+from npuzzle import NPuzzle, is_solvable, apply_moves
+
+FOUND = -1
+
+
+def solve_ida_star(initial_state, heuristic='manhattan'):
+    """
+    Solves an N x N puzzle optimally with IDA*.
+
+    Args:
+        initial_state (tuple of tuples): The starting configuration of the puzzle.
+        heuristic (str): 'manhattan' (updated incrementally per move) or 'pdb'
+                         (the additive pattern databases from pattern_db.py).
+
+    Returns:
+        list of str or None: A list of moves to solve the puzzle, or None if unsolvable.
+    """
+    if not is_solvable(initial_state):
+        return None
+
+    puzzle = NPuzzle(initial_state)
+    board = puzzle.board
+    moves = puzzle.moves
+    path = []
+
+    if heuristic == 'manhattan':
+        def child_h(h, delta):
+            return h + delta
+        start_h = puzzle.manhattan()
+    elif heuristic == 'pdb':
+        estimate = pattern_db.load(puzzle.size, build_missing=True).estimate
+        def child_h(h, delta):
+            return estimate(board)
+        start_h = estimate(board)
+    else:
+        raise ValueError(f"Unknown heuristic: {heuristic}")
+
+    def search(g, h, bound, previous):
+        """Depth-first probe below the current board; returns FOUND or the smallest f cut off."""
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0 and puzzle.is_goal():
+            return FOUND
+        minimum = float('inf')
+        blank = puzzle.blank
+        for move_name, target in moves[blank]:
+            # Moving the blank straight back would only undo the last move
+            if target == previous:
+                continue
+            delta = puzzle.move(target)
+            path.append(move_name)
+            t = search(g + 1, child_h(h, delta), bound, blank)
+            if t == FOUND:
+                return FOUND
+            path.pop()
+            puzzle.move(blank)
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    bound = start_h
+    while True:
+        t = search(0, start_h, bound, None)
+        if t == FOUND:
+            return list(path)
+        if t == float('inf'):
+            return None
+        bound = t
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    # A 15-puzzle nine moves from the goal: prints the moves IDA* finds and
+    # the board they lead to
+    initial_state_tuple = ((5, 1, 3, 4), (9, 2, 7, 8), (13, 6, 10, 12), (0, 14, 11, 15))
+
+    solution_path = solve_ida_star(initial_state_tuple)
+
+    if solution_path is not None:
+        print(f"Solution found in {len(solution_path)} moves!")
+        print("Path:", " -> ".join(solution_path))
+        final_state = apply_moves(initial_state_tuple, solution_path)[-1] if solution_path else initial_state_tuple
+        for row in final_state:
+            print(" ".join(f"{tile:2}" if tile != 0 else ' _' for tile in row))
+    else:
+        print("No solution found. The puzzle is unsolvable.")
@@ -1,13 +1,32 @@
-import heapq
+from time import perf_counter
+
+import pattern_db
+from open_list import OPEN_LISTS
+from npuzzle import MOVES, make_goal, goal_positions, apply_moves, is_solvable
 
 class PuzzleNode:
     """A class to represent a state in the 8-puzzle search tree."""
-    def __init__(self, state, parent=None, move=None, g=0):
+    __slots__ = ('state', 'parent', 'move', 'g', 'h', 'f', 'blank', 'heuristic')
+
+    def __init__(self, state, parent=None, move=None, g=0, heuristic=None, blank=None, h=None):
         self.state = state
         self.parent = parent
         self.move = move
         self.g = g  # Cost from start to current node
-        self.h = self.calculate_manhattan_distance() # Heuristic cost to goal
+        self.heuristic = heuristic # Callable state -> estimate; None means Manhattan
+        if blank is None:
+            # Find the position of the empty tile (0)
+            for r, row in enumerate(state):
+                if 0 in row:
+                    blank = (r, row.index(0))
+                    break
+        self.blank = blank
+        if h is None:
+            if heuristic is None:
+                h = self.calculate_manhattan_distance()
+            else:
+                h = heuristic(state)
+        self.h = h # Heuristic cost to goal
         self.f = self.g + self.h # Total estimated cost
 
     def __lt__(self, other):
@@ -21,72 +40,122 @@ class PuzzleNode:
         from its goal position.
         """
         distance = 0
-        goal_state = ((1, 2, 3), (4, 5, 6), (7, 8, 0))
-        for r in range(3):
-            for c in range(3):
-                tile = self.state[r][c]
+        goal = goal_positions(len(self.state))
+        for r, row in enumerate(self.state):
+            for c, tile in enumerate(row):
                 if tile != 0:
-                    # Find the goal position of the tile
-                    goal_r, goal_c = -1, -1
-                    for gr in range(3):
-                        for gc in range(3):
-                            if goal_state[gr][gc] == tile:
-                                goal_r, goal_c = gr, gc
-                                break
+                    goal_r, goal_c = goal[tile]
                     distance += abs(r - goal_r) + abs(c - goal_c)
         return distance
 
     def get_neighbors(self):
         """Generates all valid neighbor states from the current state."""
         neighbors = []
-        # Find the position of the empty tile (0)
-        empty_r, empty_c = -1, -1
-        for r in range(3):
-            for c in range(3):
-                if self.state[r][c] == 0:
-                    empty_r, empty_c = r, c
-                    break
-        
-        # Possible moves: up, down, left, right
-        moves = {'U': (-1, 0), 'D': (1, 0), 'L': (0, -1), 'R': (0, 1)}
-        for move_name, (dr, dc) in moves.items():
+        state = self.state
+        size = len(state)
+        empty_r, empty_c = self.blank
+        goal = goal_positions(size)
+
+        for move_name, (dr, dc) in MOVES.items():
             new_r, new_c = empty_r + dr, empty_c + dc
             
-            if 0 <= new_r < 3 and 0 <= new_c < 3:
-                # Create a new state by swapping the empty tile
-                new_state_list = [list(row) for row in self.state]
-                new_state_list[empty_r][empty_c], new_state_list[new_r][new_c] = \
-                    new_state_list[new_r][new_c], new_state_list[empty_r][empty_c]
-                
-                # Convert back to tuple of tuples to be hashable
-                new_state = tuple(tuple(row) for row in new_state_list)
-                neighbors.append(PuzzleNode(new_state, self, move_name, self.g + 1))
+            if 0 <= new_r < size and 0 <= new_c < size:
+                # Create a new state by swapping the empty tile; only the
+                # one or two rows involved are rebuilt
+                tile = state[new_r][new_c]
+                rows = list(state)
+                if new_r == empty_r:
+                    row = list(state[empty_r])
+                    row[empty_c], row[new_c] = tile, 0
+                    rows[empty_r] = tuple(row)
+                else:
+                    row = list(state[empty_r])
+                    row[empty_c] = tile
+                    rows[empty_r] = tuple(row)
+                    row = list(state[new_r])
+                    row[new_c] = 0
+                    rows[new_r] = tuple(row)
+                new_state = tuple(rows)
+
+                h = None
+                if self.heuristic is None:
+                    # Only the slid tile moved, by one cell
+                    goal_r, goal_c = goal[tile]
+                    h = self.h + abs(empty_r - goal_r) + abs(empty_c - goal_c) \
+                        - abs(new_r - goal_r) - abs(new_c - goal_c)
+                neighbors.append(PuzzleNode(new_state, self, move_name, self.g + 1,
+                                            self.heuristic, (new_r, new_c), h))
                 
         return neighbors
 
-def solve_8_puzzle(initial_state):
+def get_heuristic(name, size=3):
+    """
+    Looks up a heuristic by name.
+
+    Args:
+        name (str): 'manhattan', or 'pdb' for the disjoint additive pattern
+                    databases in pattern_db.py (built on first use).
+        size (int): Board width the heuristic will be used on.
+
+    Returns:
+        callable or None: A function mapping a state to its estimate, or None
+                          for the built-in Manhattan distance.
+    """
+    if name == 'manhattan':
+        return None
+    if name == 'pdb':
+        return pattern_db.load(size, build_missing=True)
+    raise ValueError(f"Unknown heuristic: {name}")
+
+def solve_8_puzzle(initial_state, heuristic='manhattan', queue='indexed', stats=None):
     """
     Solves the 8-puzzle problem using the A* search algorithm.
+
+    Larger N x N boards work too, but A* keeps every generated node, so use
+    ida_star.solve_ida_star for 15-puzzles.
     
     Args:
         initial_state (tuple of tuples): The starting configuration of the puzzle.
+        heuristic (str): Name of the heuristic to guide the search, see get_heuristic.
+        queue (str): Open-list implementation, 'indexed' (decrease-key heap) or
+                     'lazy' (heapq with lazy deletion), see open_list.py.
+        stats (SearchStats): Filled in with search counters, if given (see
+                             search_stats.py in the Practical directory).
 
     Returns:
         list of str or None: A list of moves to solve the puzzle, or None if unsolvable.
     """
-    goal_state = ((1, 2, 3), (4, 5, 6), (7, 8, 0))
+    # Half of all boards cannot reach the goal; the parity check settles that
+    # without searching the whole reachable half of the state space
+    if not is_solvable(initial_state):
+        if stats is not None:
+            stats.finish(None)
+        return None
+
+    goal_state = make_goal(len(initial_state))
     
     # The open list is a priority queue of nodes to visit
-    open_list = []
+    open_list = OPEN_LISTS[queue]()
     # The closed set stores states that have already been visited
     closed_set = set()
 
-    start_node = PuzzleNode(initial_state)
-    heapq.heappush(open_list, start_node)
+    estimate = get_heuristic(heuristic, len(initial_state))
+    timing = stats is not None and stats.timing
+    if timing and estimate is not None:
+        estimate = stats.timed_heuristic(estimate)
+
+    start_node = PuzzleNode(initial_state, heuristic=estimate)
+    open_list.push(start_node)
+    if stats is not None:
+        stats.generated += 1
 
     while open_list:
         # Get the node with the lowest f-score
-        current_node = heapq.heappop(open_list)
+        if timing:
+            start = perf_counter()
+        current_node = open_list.pop()
+        if timing:
+            stats.queue_time += perf_counter() - start
         
         # If we reached the goal, reconstruct and return the path
         if current_node.state == goal_state:
@@ -95,28 +164,39 @@ def solve_8_puzzle(initial_state):
             while node.parent is not None:
                 path.append(node.move)
                 node = node.parent
+            if stats is not None:
+                stats.finish(len(path))
             return path[::-1] # Reverse to get path from start to goal
 
         closed_set.add(current_node.state)
 
-        for neighbor in current_node.get_neighbors():
+        if timing:
+            start, heuristic_before = perf_counter(), stats.heuristic_time
+        neighbors = current_node.get_neighbors()
+        if timing:
+            # Heuristic calls made while building the neighbors are counted apart
+            now = perf_counter()
+            stats.successor_time += now - start - (stats.heuristic_time - heuristic_before)
+            start = now
+
+        for neighbor in neighbors:
             if neighbor.state in closed_set:
+                if stats is not None:
+                    stats.duplicates += 1
                 continue
 
-            # Check if neighbor is in the open list with a higher f-score
-            in_open_list = False
-            for i, item in enumerate(open_list):
-                if item.state == neighbor.state:
-                    in_open_list = True
-                    if neighbor.g < item.g:
-                        # If we found a better path, update the node
-                        open_list[i] = neighbor
-                        heapq.heapify(open_list)
-                    break
-            
-            if not in_open_list:
-                heapq.heappush(open_list, neighbor)
+            # Adds the neighbor, or replaces its open copy if this path is cheaper
+            if not open_list.push(neighbor) and stats is not None:
+                stats.duplicates += 1
+
+        if stats is not None:
+            if timing:
+                stats.queue_time += perf_counter() - start
+            stats.generated += len(neighbors)
+            stats.expand(len(open_list), len(closed_set))
 
+    if stats is not None:
+        stats.finish(None)
     return None # No solution found
 
 def print_board(state):
@@ -140,22 +220,9 @@ if __name__ == "__main__":
         print("Path:", " -> ".join(solution_path))
 
         # Optional: Print the states along the solution path
-        current_state = [list(row) for row in initial_state_tuple]
-        for move in solution_path:
-            er, ec = -1, -1
-            for r in range(3):
-                for c in range(3):
-                    if current_state[r][c] == 0:
-                        er, ec = r, c
-            
-            if move == 'U': nr, nc = er - 1, ec
-            elif move == 'D': nr, nc = er + 1, ec
-            elif move == 'L': nr, nc = er, ec - 1
-            elif move == 'R': nr, nc = er, ec + 1
-
-            current_state[er][ec], current_state[nr][nc] = current_state[nr][nc], current_state[er][ec]
+        for move, state in zip(solution_path, apply_moves(initial_state_tuple, solution_path)):
             print(f"\nMove: {move}")
-            print_board(tuple(tuple(row) for row in current_state))
+            print_board(state)
             
     else:
         print("No solution found. The puzzle might be unsolvable.")
@@ -0,0 +1,126 @@
+"""
+N x N sliding-tile puzzle model shared by the prac_5 solvers.
+
+States are tuples of rows, as in main.py. The goal for a board of width N has
+the tiles 1 .. N*N-1 in reading order with the blank (0) in the last cell.
+Move names describe the direction the blank travels.
+"""
+
+MOVES = {'U': (-1, 0), 'D': (1, 0), 'L': (0, -1), 'R': (0, 1)}
+
+_goal_positions = {}
+
+
+def make_goal(size):
+    """Returns the goal state for a size x size board."""
+    tiles = list(range(1, size * size)) + [0]
+    return tuple(tuple(tiles[r * size:(r + 1) * size]) for r in range(size))
+
+
+def goal_positions(size):
+    """Returns a list mapping each tile to its (row, col) in the goal; cached per size."""
+    positions = _goal_positions.get(size)
+    if positions is None:
+        positions = [(size - 1, size - 1)] + [divmod(tile - 1, size) for tile in range(1, size * size)]
+        _goal_positions[size] = positions
+    return positions
+
+
+def flatten(state):
+    """Turns a tuple of rows into a flat tuple in reading order."""
+    return tuple(tile for row in state for tile in row)
+
+
+def to_rows(board, size):
+    """Turns a flat board back into a tuple of rows."""
+    return tuple(tuple(board[r * size:(r + 1) * size]) for r in range(size))
+
+
+def is_solvable(state):
+    """
+    Checks whether the goal can be reached, using inversion parity.
+
+    For odd widths the number of inversions must be even. For even widths
+    the inversions plus the blank's row counted from the bottom must be odd.
+    """
+    size = len(state)
+    board = flatten(state)
+    tiles = [t for t in board if t != 0]
+    inversions = 0
+    for i, tile in enumerate(tiles):
+        for other in tiles[i + 1:]:
+            if other < tile:
+                inversions += 1
+    if size % 2 == 1:
+        return inversions % 2 == 0
+    blank_row_from_bottom = size - board.index(0) // size
+    return (inversions + blank_row_from_bottom) % 2 == 1
+
+
+def apply_moves(state, moves):
+    """Returns the list of states visited when playing moves from state."""
+    size = len(state)
+    board = list(flatten(state))
+    blank = board.index(0)
+    states = []
+    for move in moves:
+        dr, dc = MOVES[move]
+        target = blank + dr * size + dc
+        board[blank], board[target] = board[target], 0
+        blank = target
+        states.append(to_rows(board, size))
+    return states
+
+
+class NPuzzle:
+    """
+    A single mutable board with in-place moves.
+
+    The board is a flat list that is changed by move() and restored by moving
+    the blank back to where it came from, so a depth-first search never copies
+    a state. Legal moves for every blank position and each tile's distance to
+    its goal cell are precomputed.
+    """
+    def __init__(self, state):
+        self.size = size = len(state)
+        self.board = list(flatten(state))
+        self.blank = self.board.index(0)
+        self.goal = list(flatten(make_goal(size)))
+
+        # moves[cell] lists (move name, cell the blank slides into)
+        self.moves = []
+        for cell in range(size * size):
+            r, c = divmod(cell, size)
+            options = []
+            for name, (dr, dc) in MOVES.items():
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < size and 0 <= nc < size:
+                    options.append((name, nr * size + nc))
+            self.moves.append(tuple(options))
+
+        # distance[tile][cell] is the Manhattan distance of tile at cell from its goal
+        self.distance = [[0] * (size * size) for _ in range(size * size)]
+        for tile in range(1, size * size):
+            goal_r, goal_c = divmod(tile - 1, size)
+            for cell in range(size * size):
+                r, c = divmod(cell, size)
+                self.distance[tile][cell] = abs(r - goal_r) + abs(c - goal_c)
+
+    def manhattan(self):
+        """Sum of the Manhattan distances of all tiles on the current board."""
+        return sum(self.distance[tile][cell] for cell, tile in enumerate(self.board) if tile)
+
+    def move(self, target):
+        """Slides the blank into target and returns the change in Manhattan distance."""
+        board = self.board
+        blank = self.blank
+        tile = board[target]
+        board[blank], board[target] = tile, 0
+        self.blank = target
+        return self.distance[tile][blank] - self.distance[tile][target]
+
+    def is_goal(self):
+        return self.board == self.goal
+
+    def state(self):
+        return to_rows(self.board, self.size)
@@ -0,0 +1,152 @@
+"""
+Open-list implementations for the A* solver in main.py.
+
+Both classes order nodes by f, break ties on lower h (equivalently higher g,
+since f = g + h) and then by insertion order. Pushing a state that is already
+open keeps whichever copy has the smaller g, so the search loop never has to
+scan the open list for duplicates.
+
+- IndexedHeap keeps one entry per state and a state -> heap position index,
+  so an improvement is a true decrease-key sifted up in O(log n).
+- LazyOpenList pushes improvements as new entries into a plain heapq and
+  remembers the best node per state; outdated entries are skipped on pop.
+  It does more pushes but each one is cheaper.
+"""
+
+import heapq
+from itertools import count
+
+
+class IndexedHeap:
+    """Binary min-heap of nodes with a state -> position index and decrease-key."""
+    def __init__(self):
+        self.heap = []       # entries are [(f, h, serial), node]
+        self.position = {}   # state -> index of its entry in self.heap
+        self.serial = count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, state):
+        return state in self.position
+
+    def get(self, state):
+        """Returns the open node for state, or None."""
+        i = self.position.get(state)
+        return None if i is None else self.heap[i][1]
+
+    def push(self, node):
+        """
+        Adds node, or lowers the key of its state if node reached it more cheaply.
+
+        Returns:
+            bool: True if the open list changed.
+        """
+        i = self.position.get(node.state)
+        if i is None:
+            self.heap.append([(node.f, node.h, next(self.serial)), node])
+            self.position[node.state] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return True
+        if node.g >= self.heap[i][1].g:
+            return False
+        self.decrease_key(i, node)
+        return True
+
+    def decrease_key(self, i, node):
+        """Replaces the entry at heap index i with a node of lower f and restores heap order."""
+        self.heap[i] = [(node.f, node.h, next(self.serial)), node]
+        self._sift_up(i)
+        # h is a function of the state in A*, but stay correct if the key rose
+        self._sift_down(self.position[node.state])
+
+    def pop(self):
+        """Removes and returns the node with the lowest key."""
+        heap = self.heap
+        if not heap:
+            raise IndexError("pop from an empty open list")
+        last = heap.pop()
+        if not heap:
+            del self.position[last[1].state]
+            return last[1]
+        top = heap[0]
+        heap[0] = last
+        self.position[last[1].state] = 0
+        del self.position[top[1].state]
+        self._sift_down(0)
+        return top[1]
+
+    def _sift_up(self, i):
+        heap, position = self.heap, self.position
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if entry[0] >= heap[parent][0]:
+                break
+            heap[i] = heap[parent]
+            position[heap[i][1].state] = i
+            i = parent
+        heap[i] = entry
+        position[entry[1].state] = i
+
+    def _sift_down(self, i):
+        heap, position = self.heap, self.position
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if entry[0] <= heap[child][0]:
+                break
+            heap[i] = heap[child]
+            position[heap[i][1].state] = i
+            i = child
+        heap[i] = entry
+        position[entry[1].state] = i
+
+
+class LazyOpenList:
+    """heapq open list with lazy deletion and a best-node map per state."""
+    def __init__(self):
+        self.heap = []   # entries are (f, h, serial, node)
+        self.best = {}   # state -> cheapest open node for that state
+        self.serial = count()
+
+    def __len__(self):
+        return len(self.best)
+
+    def __contains__(self, state):
+        return state in self.best
+
+    def get(self, state):
+        """Returns the open node for state, or None."""
+        return self.best.get(state)
+
+    def push(self, node):
+        """
+        Adds node unless its state is already open with a g at least as low.
+
+        Returns:
+            bool: True if the open list changed.
+        """
+        current = self.best.get(node.state)
+        if current is not None and node.g >= current.g:
+            return False
+        self.best[node.state] = node
+        heapq.heappush(self.heap, (node.f, node.h, next(self.serial), node))
+        return True
+
+    def pop(self):
+        """Removes and returns the node with the lowest key, skipping outdated entries."""
+        while self.heap:
+            node = heapq.heappop(self.heap)[3]
+            if self.best.get(node.state) is node:
+                del self.best[node.state]
+                return node
+        raise IndexError("pop from an empty open list")
+
+
+OPEN_LISTS = {'indexed': IndexedHeap, 'lazy': LazyOpenList}
@@ -0,0 +1,308 @@
+"""
+Disjoint additive pattern databases (PDBs) for the sliding-tile puzzle.
+
+The tiles are split into disjoint groups. For each group a backward BFS from
+the goal records the fewest moves *of that group's tiles* needed to bring them
+home, counting moves of every other tile as free. Because no move is counted
+by two groups, the per-group values can be summed and the total is still an
+admissible heuristic, and a much stronger one than Manhattan distance.
+
+Each table is indexed by the positions of its tiles, ranked as a partial
+permutation, and by the blank's cell, and stores one byte per entry. The
+blank moves freely between the cells not covered by the group, so every cell
+of one such region holds the same value; keeping the blank in the key (rather
+than the best value over all regions) makes the summed heuristic consistent,
+so A* with a closed set still finds optimal solutions. Tables are built once, written
+to disk and memory-mapped at solve time, so loading is instant and several
+processes reading the same file share the pages.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+MAGIC = b'PDB2'
+HEADER = struct.Struct('<4sBB')
+UNREACHED = 255
+
+# Groups used when no partition is given: 4-4 for the 8-puzzle and 5-5-5
+# for the 15-puzzle (goal has tiles in order with the blank last).
+DEFAULT_PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)),
+}
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdb')
+
+_loaded = {}
+
+
+def default_partition(size):
+    """
+    The partition used when none is given.
+
+    Raises:
+        ValueError: If there is no default partition for the board size.
+    """
+    if size not in DEFAULT_PARTITIONS:
+        raise ValueError(f"no default partition for {size}x{size} boards")
+    return DEFAULT_PARTITIONS[size]
+
+
+def neighbor_cells(size):
+    """Returns, for every cell of a size x size board, the orthogonally adjacent cells."""
+    cells = []
+    for i in range(size * size):
+        r, c = divmod(i, size)
+        adjacent = []
+        for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < size and 0 <= nc < size:
+                adjacent.append(nr * size + nc)
+        cells.append(tuple(adjacent))
+    return cells
+
+
+def rank_weights(num_cells, k):
+    """Place values for ranking k distinct positions out of num_cells."""
+    weights = []
+    for i in range(k):
+        w = 1
+        for j in range(num_cells - 1 - i, num_cells - k, -1):
+            w *= j
+        weights.append(w)
+    return weights
+
+
+def table_size(num_cells, k):
+    """Number of ordered placements of k tiles on num_cells cells."""
+    size = 1
+    for j in range(num_cells, num_cells - k, -1):
+        size *= j
+    return size
+
+
+def rank(positions, weights):
+    """
+    Ranks a tuple of distinct cell indices as a partial permutation.
+
+    Each position is replaced by the number of still-unused cells below it,
+    giving a dense index in [0, table_size(num_cells, len(positions))).
+    """
+    index = 0
+    used = 0
+    for i, p in enumerate(positions):
+        index += (p - bin(used & ((1 << p) - 1)).count('1')) * weights[i]
+        used |= 1 << p
+    return index
+
+
+def _blank_regions(occupied, num_cells, adjacency, cache):
+    """
+    Splits the cells not covered by pattern tiles into connected regions.
+
+    Returns a tuple mapping each cell to the lowest cell of its region, or -1
+    for an occupied cell. The blank moves freely inside a region, so states
+    only need to remember which region it is in.
+    """
+    regions = cache.get(occupied)
+    if regions is not None:
+        return regions
+    regions = [-1] * num_cells
+    for start in range(num_cells):
+        if occupied >> start & 1 or regions[start] != -1:
+            continue
+        regions[start] = start
+        stack = [start]
+        while stack:
+            cell = stack.pop()
+            for nxt in adjacency[cell]:
+                if not occupied >> nxt & 1 and regions[nxt] == -1:
+                    regions[nxt] = start
+                    stack.append(nxt)
+    regions = tuple(regions)
+    cache[occupied] = regions
+    return regions
+
+
+def build_table(size, tiles):
+    """
+    Runs the backward BFS for one tile group and returns its distance table.
+
+    Args:
+        size (int): Board width (3 for the 8-puzzle, 4 for the 15-puzzle).
+        tiles (tuple of int): The tiles of this pattern.
+
+    Returns:
+        bytearray: Distance at rank * num_cells + blank cell for every ranked
+                   placement of the pattern tiles (UNREACHED where the blank
+                   would sit on a pattern tile).
+    """
+    num_cells = size * size
+    k = len(tiles)
+    adjacency = neighbor_cells(size)
+    weights = rank_weights(num_cells, k)
+    region_cache = {}
+
+    table = bytearray([UNREACHED]) * (table_size(num_cells, k) * num_cells)
+
+    def record(index, regions, region, depth):
+        # every cell of the blank's region gets the same distance
+        base = index * num_cells
+        for cell in range(num_cells):
+            if regions[cell] == region:
+                table[base + cell] = depth
+
+    goal = tuple(t - 1 for t in tiles)
+    occupied = 0
+    for p in goal:
+        occupied |= 1 << p
+    goal_regions = _blank_regions(occupied, num_cells, adjacency, region_cache)
+    blank_region = goal_regions[num_cells - 1]
+    record(rank(goal, weights), goal_regions, blank_region, 0)
+
+    layer = [(goal, occupied, blank_region)]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for positions, occupied, region in layer:
+            regions = _blank_regions(occupied, num_cells, adjacency, region_cache)
+            for i, cell in enumerate(positions):
+                for target in adjacency[cell]:
+                    if regions[target] != region:
+                        continue
+                    # slide tile i into the blank's region; its old cell becomes free
+                    moved = positions[:i] + (target,) + positions[i + 1:]
+                    moved_occupied = occupied ^ (1 << cell) ^ (1 << target)
+                    moved_regions = _blank_regions(moved_occupied, num_cells, adjacency, region_cache)
+                    moved_region = moved_regions[cell]
+                    index = rank(moved, weights)
+                    # a region is identified by its lowest cell, so that cell's entry marks it seen
+                    if table[index * num_cells + moved_region] != UNREACHED:
+                        continue
+                    record(index, moved_regions, moved_region, depth)
+                    next_layer.append((moved, moved_occupied, moved_region))
+        layer = next_layer
+    return table
+
+
+def table_path(size, tiles, directory=None):
+    name = 'pdb%d_%s.bin' % (size, '-'.join(str(t) for t in tiles))
+    return os.path.join(directory or DEFAULT_DIRECTORY, name)
+
+
+def write_table(path, size, tiles, table):
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    # A temporary file of its own, so processes building the same table at
+    # once never write into each other's file; the last rename wins
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, size, len(tiles)))
+            f.write(bytes(tiles))
+            f.write(table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def build(size, partition=None, directory=None):
+    """Builds and saves every table of a partition, returning the file paths."""
+    partition = partition or default_partition(size)
+    paths = []
+    for tiles in partition:
+        path = table_path(size, tiles, directory)
+        write_table(path, size, tiles, build_table(size, tiles))
+        paths.append(path)
+    return paths
+
+
+class PatternDatabase:
+    """A single memory-mapped pattern table."""
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, k = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a pattern database")
+        self.tiles = tuple(self.data[HEADER.size:HEADER.size + k])
+        self.offset = HEADER.size + k
+        self.weights = rank_weights(self.size * self.size, k)
+        self.num_cells = self.size * self.size
+        if len(self.data) != self.offset + table_size(self.num_cells, k) * self.num_cells:
+            raise ValueError(f"{path} is truncated")
+
+    def lookup(self, where):
+        """Returns the stored distance given the cell of every tile (where[tile], the blank at where[0])."""
+        return self.data[self.offset + rank([where[t] for t in self.tiles], self.weights) * self.num_cells
+                         + where[0]]
+
+
+class AdditivePDB:
+    """
+    Sum of disjoint pattern databases, usable as a heuristic on puzzle states.
+
+    Calling it with a state (tuple of rows) returns the heuristic estimate.
+    """
+    def __init__(self, databases):
+        self.databases = databases
+        self.num_cells = databases[0].size ** 2
+
+    def __call__(self, state):
+        return self.estimate([tile for row in state for tile in row])
+
+    def estimate(self, board):
+        """Heuristic estimate for a flat board in reading order."""
+        where = [0] * self.num_cells
+        for cell, tile in enumerate(board):
+            where[tile] = cell
+        return sum(db.lookup(where) for db in self.databases)
+
+
+def load(size, partition=None, directory=None, build_missing=False):
+    """
+    Memory-maps the tables of a partition, building them first if asked.
+
+    Loaded databases are cached per process, so repeated calls are free.
+
+    Raises:
+        FileNotFoundError: If a table is missing and build_missing is False.
+        ValueError: If no partition is given and the size has no default, or
+                    a table file is invalid (or in an older format) and
+                    build_missing is False.
+    """
+    partition = tuple(tuple(group) for group in (partition or default_partition(size)))
+    key = (size, partition, directory)
+    if key in _loaded:
+        return _loaded[key]
+    databases = []
+    for tiles in partition:
+        path = table_path(size, tiles, directory)
+        if os.path.exists(path):
+            try:
+                databases.append(PatternDatabase(path))
+                continue
+            except ValueError:
+                if not build_missing:
+                    raise
+                # an older table format or a damaged file: rebuild it below
+        elif not build_missing:
+            raise FileNotFoundError(
+                f"{path} not found; build it with: python pattern_db.py {size}")
+        write_table(path, size, tiles, build_table(size, tiles))
+        databases.append(PatternDatabase(path))
+    _loaded[key] = AdditivePDB(databases)
+    return _loaded[key]
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    # Build the default tables, e.g. `python pattern_db.py 4` for the 15-puzzle
+    board_size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for table_file in build(board_size):
+        print("Wrote", table_file)
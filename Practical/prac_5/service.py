@@ -0,0 +1,325 @@
+"""
+Batch and service front end for the prac_5 puzzle solvers.
+
+A PuzzleService answers many queries in a row without repeating work:
+
+- Unsolvable boards are rejected at once with npuzzle.is_solvable, an
+  inversion-parity check, instead of a search of the whole reachable half of
+  the state space.
+- Solutions are kept in a bounded LRU cache keyed by start board, so a
+  repeated query is a dictionary lookup.
+- solve_batch answers cache hits and unsolvable boards directly, solves each
+  distinct remaining board once, and fans them out over a process pool.
+
+The service speaks JSON lines, one request and one response per line, either
+over stdin/stdout or over a Unix socket:
+
+    {"id": 1, "state": [[1, 2, 3], [4, 5, 6], [7, 0, 8]]}
+        -> {"id": 1, "solvable": true, "moves": ["R"], "cached": false}
+    {"id": 2, "states": [[[...]], [[...]]]}
+        -> {"id": 2, "results": [{"solvable": ..., "moves": ..., "cached": ...}, ...]}
+    {"id": 3, "stats": true}
+        -> {"id": 3, "cache_entries": ..., "hits": ..., "misses": ..., "rejected": ..., "solved": ...}
+
+A malformed request, or one the solver fails on, gets
+{"id": ..., "error": "..."} and the service goes on. In a batch, a board
+the heuristic cannot handle gets {"error": "..."} as its own result and the
+other boards are answered as usual.
+
+    python service.py                         # stdin/stdout
+    python service.py --socket /tmp/puzzle.sock
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import signal
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+
+from ida_star import solve_ida_star
+from main import get_heuristic, solve_8_puzzle
+from npuzzle import flatten, is_solvable
+
+
+class SolutionCache:
+    """A bounded mapping from start board to solution, evicting the least recently used."""
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Returns the cached moves for key (or None), marking it as recently used."""
+        moves = self.entries.get(key)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return moves
+
+    def put(self, key, moves):
+        self.entries[key] = moves
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+def parse_state(data):
+    """
+    Turns a JSON board (a list of rows) into a tuple of rows.
+
+    Raises:
+        ValueError: If the board is not square or its tiles are not 0 .. N*N-1.
+    """
+    if not isinstance(data, (list, tuple)) or not data:
+        raise ValueError("a state must be a non-empty list of rows")
+    size = len(data)
+    if any(not isinstance(row, (list, tuple)) or len(row) != size for row in data):
+        raise ValueError("a state must be a square list of rows")
+    state = tuple(tuple(row) for row in data)
+    tiles = flatten(state)
+    if any(type(tile) is not int for tile in tiles) or sorted(tiles) != list(range(size * size)):
+        raise ValueError(f"the tiles of a {size}x{size} board must be 0 .. {size * size - 1}")
+    return state
+
+
+def _solve(task):
+    """Solves one board; runs in a pool worker."""
+    state, solver, heuristic = task
+    if solver == 'ida_star':
+        return solve_ida_star(state, heuristic)
+    return solve_8_puzzle(state, heuristic)
+
+
+class PuzzleService:
+    """Answers single and batch puzzle queries with a parity pre-check and an LRU cache."""
+    def __init__(self, cache_size=10000, workers=None, solver='auto', heuristic='manhattan'):
+        """
+        Args:
+            cache_size (int): Most solutions kept in the cache.
+            workers (int): Processes for batches (default: all cores). With 1
+                           everything is solved in this process.
+            solver (str): 'astar' (main.solve_8_puzzle), 'ida_star', or 'auto'
+                          for A* on 3x3 boards and IDA* on larger ones.
+            heuristic (str): Passed to the solver, see main.get_heuristic.
+        """
+        self.cache = SolutionCache(cache_size)
+        self.workers = workers or os.cpu_count() or 1
+        self.solver = solver
+        self.heuristic = heuristic
+        self.rejected = 0     # unsolvable boards answered by the parity check
+        self.solved = 0       # searches run
+        self.pool = None      # started on the first batch that needs it
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def _task(self, state):
+        solver = self.solver
+        if solver == 'auto':
+            solver = 'astar' if len(state) <= 3 else 'ida_star'
+        return state, solver, self.heuristic
+
+    def _lookup(self, state):
+        """Returns (solvable, moves, cached), with moves None on a cache miss."""
+        if not is_solvable(state):
+            self.rejected += 1
+            return False, None, False
+        moves = self.cache.get(flatten(state))
+        return True, moves, moves is not None
+
+    def solve(self, state):
+        """
+        Solves one board.
+
+        Returns:
+            list of str or None: The moves, or None if the board is unsolvable.
+        """
+        solvable, moves, cached = self._lookup(state)
+        if not solvable:
+            return None
+        if not cached:
+            moves = _solve(self._task(state))
+            self.solved += 1
+            self.cache.put(flatten(state), moves)
+        return list(moves)
+
+    def solve_batch(self, states):
+        """
+        Solves many boards, running the searches in parallel.
+
+        Returns:
+            list of dict: Per board, in order, {'solvable', 'moves', 'cached'}
+                          with moves None for an unsolvable board. A board the
+                          heuristic cannot handle (e.g. 'pdb' on a size with
+                          no tables) gets {'error': ...} instead; the other
+                          boards are still solved.
+        """
+        results = [None] * len(states)
+        pending = {}    # flat board -> indexes of the boards waiting for it
+        for i, state in enumerate(states):
+            solvable, moves, cached = self._lookup(state)
+            if not solvable or cached:
+                results[i] = {'solvable': solvable, 'moves': None if moves is None else list(moves),
+                              'cached': cached}
+            else:
+                pending.setdefault(flatten(state), []).append(i)
+
+        # Load (or build) the heuristic's tables here, before the pool forks,
+        # so the workers inherit them instead of each building their own
+        failed = {}     # board size -> why the heuristic is not available there
+        for size in {len(states[indexes[0]]) for indexes in pending.values()}:
+            try:
+                get_heuristic(self.heuristic, size)
+            except (ValueError, OSError) as error:
+                failed[size] = str(error)
+        for key, indexes in list(pending.items()):
+            size = len(states[indexes[0]])
+            if size in failed:
+                del pending[key]
+                for i in indexes:
+                    results[i] = {'error': failed[size]}
+
+        tasks = [self._task(states[indexes[0]]) for indexes in pending.values()]
+        if len(tasks) > 1 and self.workers > 1:
+            if self.pool is None:
+                self.pool = mp.Pool(self.workers)
+            solutions = self.pool.map(_solve, tasks, chunksize=max(1, len(tasks) // (4 * self.workers)))
+        else:
+            solutions = [_solve(task) for task in tasks]
+
+        self.solved += len(tasks)
+        for (key, indexes), moves in zip(pending.items(), solutions):
+            self.cache.put(key, moves)
+            for i in indexes:
+                results[i] = {'solvable': True, 'moves': list(moves), 'cached': False}
+        return results
+
+    def stats(self):
+        return {'cache_entries': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses,
+                'rejected': self.rejected, 'solved': self.solved}
+
+    def handle(self, request):
+        """
+        Answers one JSON request (see the module docstring).
+
+        Returns:
+            dict: The response, with an 'error' entry if the request was
+                  malformed or could not be solved.
+        """
+        response = {'id': request.get('id')} if isinstance(request, dict) else {'id': None}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+            if request.get('stats'):
+                response.update(self.stats())
+            elif 'states' in request:
+                response['results'] = self.solve_batch([parse_state(s) for s in request['states']])
+            elif 'state' in request:
+                response.update(self.solve_batch([parse_state(request['state'])])[0])
+            else:
+                raise ValueError("expected 'state', 'states' or 'stats'")
+        except (ValueError, TypeError) as error:
+            response['error'] = str(error)
+        except Exception as error:
+            # A solver failure is answered like any other error; the service goes on
+            response['error'] = f"{type(error).__name__}: {error}"
+        return response
+
+
+def serve_lines(service, infile, outfile):
+    """Answers JSON-lines requests from infile until it ends, one response line each."""
+    for line in infile:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            response = {'id': None, 'error': f"invalid JSON: {error}"}
+        else:
+            response = service.handle(request)
+        outfile.write(json.dumps(response) + "\n")
+        outfile.flush()
+
+
+def serve_unix(service, path):
+    """
+    Serves JSON lines on a Unix socket until interrupted.
+
+    Every connection gets its own thread; requests are answered one at a
+    time, since they share the cache and the pool.
+    """
+    lock = threading.Lock()
+
+    class LockedService:
+        def handle(self, request):
+            with lock:
+                return service.handle(request)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            reader = (line.decode() for line in self.rfile)
+            writer = _SocketWriter(self.wfile)
+            serve_lines(LockedService(), reader, writer)
+
+    if os.path.exists(path):
+        os.remove(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class _SocketWriter:
+    """Text-mode write/flush over a socket's binary file, as serve_lines expects."""
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        self.wfile.write(text.encode())
+
+    def flush(self):
+        self.wfile.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sliding-puzzle solver service (JSON lines).")
+    parser.add_argument('--socket', help="serve on this Unix socket instead of stdin/stdout")
+    parser.add_argument('--workers', type=int, help="processes for batches (default: all cores)")
+    parser.add_argument('--cache-size', type=int, default=10000, help="solutions kept in the LRU cache")
+    parser.add_argument('--solver', choices=['auto', 'astar', 'ida_star'], default='auto')
+    parser.add_argument('--heuristic', choices=['manhattan', 'pdb'], default='manhattan')
+    args = parser.parse_args(argv)
+
+    with PuzzleService(args.cache_size, args.workers, args.solver, args.heuristic) as service:
+        if args.socket:
+            # Exit cleanly on SIGTERM too, so the socket file is removed
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+            serve_unix(service, args.socket)
+        else:
+            serve_lines(service, sys.stdin, sys.stdout)
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    main()
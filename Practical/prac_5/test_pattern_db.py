@@ -0,0 +1,55 @@
+"""
+Checks that A* with the additive pattern databases stays optimal.
+
+A* keeps a closed set and never reopens a state, so it is only optimal with
+a consistent heuristic. These tests compare its path lengths with Manhattan
+A* (also consistent, so optimal) and check consistency directly.
+
+    python -m pytest test_pattern_db.py
+"""
+
+import random
+
+import pattern_db
+from main import solve_8_puzzle
+from npuzzle import is_solvable
+from pattern_db import neighbor_cells
+
+
+def random_boards(count, seed=0):
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        tiles = list(range(9))
+        rng.shuffle(tiles)
+        board = (tuple(tiles[0:3]), tuple(tiles[3:6]), tuple(tiles[6:9]))
+        if is_solvable(board):
+            boards.append(board)
+    return boards
+
+
+def test_reported_board_is_solved_optimally():
+    board = ((4, 5, 6), (3, 8, 0), (1, 2, 7))
+    for queue in ('indexed', 'lazy'):
+        assert len(solve_8_puzzle(board, 'pdb', queue=queue)) == 21
+
+
+def test_pdb_path_lengths_match_manhattan_optima():
+    for board in random_boards(100):
+        optimal = len(solve_8_puzzle(board, 'manhattan'))
+        for queue in ('indexed', 'lazy'):
+            assert len(solve_8_puzzle(board, 'pdb', queue=queue)) == optimal, board
+
+
+def test_pdb_is_consistent():
+    heuristic = pattern_db.load(3, build_missing=True)
+    adjacency = neighbor_cells(3)
+    assert heuristic.estimate([1, 2, 3, 4, 5, 6, 7, 8, 0]) == 0
+    for board in random_boards(2000, seed=1):
+        flat = [tile for row in board for tile in row]
+        h = heuristic.estimate(flat)
+        blank = flat.index(0)
+        for target in adjacency[blank]:
+            moved = list(flat)
+            moved[blank], moved[target] = moved[target], 0
+            assert abs(heuristic.estimate(moved) - h) <= 1, (flat, moved)
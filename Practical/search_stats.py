@@ -0,0 +1,199 @@
+"""
+Instrumentation shared by the puzzle searches of Prac_1, Prac_2 and prac_5.
+
+breadth_first_search and bidirectional_search (Prac_1),
+iterative_deepening_search and DFID (Prac_2) and solve_8_puzzle (prac_5) all
+take an optional `stats` argument. Pass a SearchStats to have it filled in;
+leave it out and the hot loops only pay for a None check per expanded node.
+The solvers never import this module, they just use the attributes below,
+so any object with the same attributes works too.
+
+Counters:
+    generated      nodes created, including the start node
+    expanded       nodes whose successors were generated
+    duplicates     successors dropped because their state was already seen
+                   (or, for A*, already open at a lower cost)
+    max_frontier   largest open list / queue / DFS stack
+    max_closed     largest closed (visited) set
+    depth          depth of the solution found, None if there is none
+
+With SearchStats(timing=True) the solvers also split their time between
+heuristic evaluation, successor generation and queue (frontier and closed
+set) operations. That costs two clock reads per phase and node, so it is off
+by default.
+
+run() wraps a whole search with cProfile and/or tracemalloc, which keeps
+profiling out of the solvers entirely.
+"""
+
+import cProfile
+import math
+import pstats
+import time
+import tracemalloc
+
+
+class SearchStats:
+    """What a search did, filled in by the solver."""
+    def __init__(self, timing=False, progress=None, report_every=10000):
+        """
+        Args:
+            timing (bool): Also time the heuristic, successor and queue phases.
+            progress (callable): Called with this SearchStats every
+                                 report_every expansions, if given.
+            report_every (int): Expansions between progress calls.
+        """
+        self.generated = 0
+        self.expanded = 0
+        self.duplicates = 0
+        self.max_frontier = 0
+        self.max_closed = 0
+        self.depth = None
+        self.solved = False
+        self.timing = timing
+        self.heuristic_time = 0.0
+        self.successor_time = 0.0
+        self.queue_time = 0.0
+        self.progress = progress
+        self.report_every = report_every
+        self._next_report = report_every if progress is not None else None
+        self.profile = None       # pstats.Stats after run(..., profile=True)
+        self.peak_memory = None   # bytes, after run(..., memory=True)
+        self.start_time = time.perf_counter()
+        self.elapsed = 0.0
+
+    def expand(self, frontier_size, closed_size):
+        """Counts one expansion and the frontier and closed-set sizes at that point."""
+        self.expanded += 1
+        if frontier_size > self.max_frontier:
+            self.max_frontier = frontier_size
+        if closed_size > self.max_closed:
+            self.max_closed = closed_size
+        if self._next_report is not None and self.expanded >= self._next_report:
+            self._next_report += self.report_every
+            self.progress(self)
+
+    def finish(self, depth):
+        """Marks the end of the search; depth is the solution depth or None."""
+        self.depth = depth
+        self.solved = depth is not None
+        self.elapsed = time.perf_counter() - self.start_time
+
+    def timed_heuristic(self, heuristic):
+        """Wraps a heuristic callable so its calls are added to heuristic_time."""
+        clock = time.perf_counter
+
+        def timed(state):
+            start = clock()
+            h = heuristic(state)
+            self.heuristic_time += clock() - start
+            return h
+        return timed
+
+    def effective_branching_factor(self, tolerance=1e-6):
+        """
+        The branching factor b* of a uniform tree of the solution depth with
+        as many nodes as were generated: generated = 1 + b* + ... + b*^depth.
+
+        Returns:
+            float or None: b*, or None without a solution of depth >= 1.
+        """
+        if not self.depth or self.generated <= 1:
+            return None
+        depth, total = self.depth, self.generated
+
+        def reaches_total(b):
+            # 1 + b + ... + b^depth >= total, stopping as soon as it is clear,
+            # so deep searches never take b to a huge power
+            size = term = 1.0
+            for _ in range(depth):
+                term *= b
+                size += term
+                if size >= total:
+                    return True
+            return size >= total
+
+        # b*^depth < total, so b* < total ** (1 / depth)
+        low, high = 0.0, math.exp(math.log(total) / depth) + 1
+        while high - low > tolerance:
+            middle = (low + high) / 2
+            if reaches_total(middle):
+                high = middle
+            else:
+                low = middle
+        return (low + high) / 2
+
+    def nodes_per_second(self):
+        elapsed = self.elapsed or (time.perf_counter() - self.start_time)
+        return self.expanded / elapsed if elapsed else 0.0
+
+    def run(self, solver, *args, profile=False, memory=False, **kwargs):
+        """
+        Calls solver(*args, stats=self, **kwargs), optionally under cProfile
+        and/or tracemalloc.
+
+        Args:
+            solver (callable): A search function taking a stats argument.
+            profile (bool): Keep a pstats.Stats of the run in self.profile.
+            memory (bool): Keep the tracemalloc peak (bytes) in self.peak_memory.
+
+        Returns:
+            Whatever solver returns.
+        """
+        profiler = cProfile.Profile() if profile else None
+        if memory:
+            tracemalloc.start()
+        self.start_time = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            return solver(*args, stats=self, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profile = pstats.Stats(profiler)
+            if memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+    def summary(self):
+        """A multi-line, human-readable report."""
+        lines = [
+            f"solved: {self.solved} (depth {self.depth})",
+            f"nodes: {self.generated} generated, {self.expanded} expanded, {self.duplicates} duplicates pruned",
+            f"peak frontier {self.max_frontier}, peak closed set {self.max_closed}",
+            f"time: {self.elapsed:.3f}s, {self.nodes_per_second():.0f} expansions/s",
+        ]
+        branching = self.effective_branching_factor()
+        if branching is not None:
+            lines.append(f"effective branching factor: {branching:.3f}")
+        if self.timing:
+            lines.append(f"heuristic {self.heuristic_time:.3f}s, successors {self.successor_time:.3f}s, "
+                         f"queue {self.queue_time:.3f}s")
+        if self.peak_memory is not None:
+            lines.append(f"peak memory: {self.peak_memory / 1024:.0f} KiB")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return (f"SearchStats(generated={self.generated}, expanded={self.expanded}, "
+                f"duplicates={self.duplicates}, max_frontier={self.max_frontier}, "
+                f"max_closed={self.max_closed}, depth={self.depth}, elapsed={self.elapsed:.3f}s)")
+
+
+def print_progress(stats):
+    """A progress callback that writes one status line to the console."""
+    print(f"{stats.expanded} expanded, {stats.generated} generated, frontier {stats.max_frontier}, "
+          f"closed {stats.max_closed}, {stats.nodes_per_second():.0f} expansions/s")
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    from benchmark import load_module
+
+    prac_5 = load_module('prac_5', 'main')
+    stats = SearchStats(timing=True, progress=print_progress, report_every=2000)
+    moves = stats.run(prac_5.solve_8_puzzle, ((8, 6, 7), (2, 5, 4), (3, 0, 1)), profile=True, memory=True)
+    print(f"A*: {len(moves)} moves")
+    print(stats.summary())
+    print("\nTop functions by cumulative time:")
+    stats.profile.sort_stats('cumulative').print_stats(5)